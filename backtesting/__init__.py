@@ -5,17 +5,26 @@ Orchestrates market events through EventLoop; computes metrics; ready for
 agent integration (Advisors, Validators, Observers).
 """
 
-from backtesting.engine import BacktestEngine, BacktestResult, PassThroughRiskManager
-from backtesting.data_loader import load_csv, load_dataframe
+from backtesting.engine import (
+    BacktestEngine,
+    BacktestResult,
+    EquityCurve,
+    PassThroughRiskManager,
+    VectorizedStrategy,
+)
+from backtesting.data_loader import load_csv, load_dataframe, load_parquet
 from backtesting.metrics import compute_metrics
 from backtesting.portfolio_report import print_report
 
 __all__ = [
     "BacktestEngine",
     "BacktestResult",
+    "EquityCurve",
     "PassThroughRiskManager",
+    "VectorizedStrategy",
     "load_csv",
     "load_dataframe",
+    "load_parquet",
     "compute_metrics",
     "print_report",
 ]
@@ -0,0 +1,93 @@
+"""
+Compiled kernels for the backtesting engine and metrics.
+
+Kernels are JIT-compiled with numba when it is installed (`pip install qtos-core[fast]`);
+otherwise the same functions run as plain Python with identical results.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit: return the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True)
+def run_fills(side_arr, qty_arr, price_arr, cash0, pos0):
+    """
+    Apply per-bar signals for one symbol, filling at that bar's price.
+
+    side_arr holds +1 (buy), -1 (sell) or 0 (no signal); qty_arr the requested size.
+    Same rules as BacktestEngine: buys need enough cash, sells are capped at the
+    held position, bars with a non-positive price do not fill.
+
+    Returns (cash, position, fill_qty, equity): fill_qty is 0 where nothing filled;
+    equity is cash + position * price after each bar.
+    """
+    n = len(price_arr)
+    fill_qty = np.zeros(n, dtype=np.float64)
+    equity = np.empty(n, dtype=np.float64)
+    cash = cash0
+    pos = pos0
+    for i in range(n):
+        price = price_arr[i]
+        side = side_arr[i]
+        qty = qty_arr[i]
+        if side != 0 and qty > 0 and price > 0:
+            if side > 0:
+                cost = qty * price
+                if cash >= cost:
+                    cash -= cost
+                    pos += qty
+                    fill_qty[i] = qty
+            else:
+                q = min(qty, pos)
+                if q > 0:
+                    cash += q * price
+                    pos -= q
+                    fill_qty[i] = q
+        equity[i] = cash + pos * price
+    return cash, pos, fill_qty, equity
+
+
+@njit(cache=True)
+def metric_pass(values, rf_per_period):
+    """
+    One pass over an equity curve for Sharpe and drawdown inputs.
+
+    Excess returns are (v[i] - v[i-1]) / max(v[i-1], 1e-14) - rf_per_period; their mean
+    and sum of squared deviations use Welford's update. Drawdown is measured from the
+    running peak; the first bar with the largest drawdown wins.
+
+    Returns (mean_excess, m2_excess, n_returns, max_drawdown, peak_at_max_drawdown).
+    """
+    n = len(values)
+    mean = 0.0
+    m2 = 0.0
+    peak = values[0]
+    max_dd = 0.0
+    peak_at_mdd = values[0]
+    for i in range(1, n):
+        prev = values[i - 1]
+        cur = values[i]
+        r = (cur - prev) / max(prev, 1e-14) - rf_per_period
+        delta = r - mean
+        mean += delta / i
+        m2 += delta * (r - mean)
+        peak = max(peak, cur)
+        dd = peak - cur
+        if dd > max_dd:
+            max_dd = dd
+            peak_at_mdd = peak
+    return mean, m2, n - 1, max_dd, peak_at_mdd
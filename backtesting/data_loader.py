@@ -6,9 +6,13 @@ Expects datetime index and OHLC(V) columns. Symbol can be inferred or passed.
 
 from __future__ import annotations
 
+import io
+from collections.abc import Sequence
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -16,26 +20,37 @@ import pandas as pd
 OHLCV = ("open", "high", "low", "close", "volume")
 OHLC = ("open", "high", "low", "close")
 
+# Common aliases
+_ALIASES = {
+    "o": "open",
+    "h": "high",
+    "l": "low",
+    "c": "close",
+    "v": "volume",
+    "vol": "volume",
+}
+
+# df.attrs key set on frames from load_dataframe: exactly the lowercase OHLC(V) columns,
+# all float64 (PaperBrokerAdapter reads "close" from such frames without checking aliases).
+SCHEMA_CANONICAL = "schema_canonical"
+
+# pyarrow's multithreaded CSV reader when installed (pip install qtos-core[io]); else pandas' C parser.
+_CSV_ENGINE = "pyarrow" if find_spec("pyarrow") is not None else "c"
+
+
+def _normalize_name(name: Any) -> str:
+    """Lowercase/strip a column name and map common aliases to open/high/low/close/volume."""
+    key = str(name).lower().strip()
+    return _ALIASES.get(key, key)
+
 
 def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Ensure columns are lowercase; map common aliases to open/high/low/close/volume."""
-    out = df.copy()
-    out.columns = [str(c).lower().strip() for c in out.columns]
-    # Common aliases
-    renames = {
-        "o": "open",
-        "h": "high",
-        "l": "low",
-        "c": "close",
-        "v": "volume",
-        "vol": "volume",
-    }
-    out = out.rename(columns={k: v for k, v in renames.items() if k in out.columns})
-    return out
+    return df.rename(columns=_normalize_name)
 
 
 def load_csv(
-    path: str | Path,
+    path: str | Path | IO[Any],
     *,
     date_column: str | None = None,
     datetime_format: str | None = None,
@@ -46,8 +61,8 @@ def load_csv(
 
     Parameters
     ----------
-    path : str or Path
-        Path to the CSV file.
+    path : str, Path or file-like
+        Path to the CSV file, or an open text/binary buffer (read from its current position).
     date_column : str, optional
         Column to use as datetime index. If None, first column or 'date' is used.
     datetime_format : str, optional
@@ -61,16 +76,99 @@ def load_csv(
         DataFrame with DatetimeIndex and columns open, high, low, close, and
         optionally volume. Index name is 'datetime'.
     """
-    df = pd.read_csv(path)
-    df = _normalize_columns(df)
-    date_col = date_column or ("date" if "date" in df.columns else df.columns[0])
-    if date_col not in df.columns:
-        date_col = df.columns[0]
-    df["datetime"] = pd.to_datetime(df[date_col], format=datetime_format)
-    df = df.drop(columns=[date_col], errors="ignore")
-    df = df.set_index("datetime").sort_index()
-    keep = [c for c in OHLCV if c in df.columns]
-    df = df[[c for c in df.columns if c in keep]]
+    # Resolve columns from the header alone, then parse only those in one read. Buffers
+    # are rewound in between (or, if not seekable, read into memory first).
+    start = None
+    if hasattr(path, "read"):
+        if not (hasattr(path, "seekable") and path.seekable()):
+            data = path.read()
+            path = io.BytesIO(data) if isinstance(data, bytes) else io.StringIO(data)
+        start = path.tell()
+    header = list(pd.read_csv(path, nrows=0).columns)
+    if start is not None:
+        path.seek(start)
+    names = [_normalize_name(c) for c in header]
+    date_col = date_column or ("date" if "date" in names else names[0])
+    if date_col not in names:
+        date_col = names[0]
+    raw_date_col = header[names.index(date_col)]
+    price_cols = {raw: "float64" for raw, name in zip(header, names) if name in OHLCV}
+    read_kwargs: dict[str, Any] = {
+        "engine": _CSV_ENGINE,
+        "usecols": [raw_date_col, *price_cols],
+        "dtype": price_cols,
+    }
+    if datetime_format is None:
+        read_kwargs["parse_dates"] = [raw_date_col]
+    df = pd.read_csv(path, **read_kwargs)
+    if datetime_format is not None:
+        df[raw_date_col] = pd.to_datetime(df[raw_date_col], format=datetime_format)
+    # index_col is not used: the pyarrow engine leaves such an index unparsed.
+    df.set_index(raw_date_col, inplace=True)
+    df.rename(columns=_normalize_name, inplace=True)
+    df.sort_index(inplace=True)
+    df.index.name = "datetime"
+    if symbol is not None:
+        df.attrs["symbol"] = symbol
+    return df
+
+
+def load_parquet(
+    path: str | Path,
+    *,
+    date_column: str | None = None,
+    columns: Sequence[str] = OHLCV,
+    symbol: str | None = None,
+) -> pd.DataFrame:
+    """
+    Load OHLC(V) data from a Parquet file. Requires pyarrow (pip install qtos-core[io]).
+
+    Only the date column and the requested price columns are read from disk.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the Parquet file.
+    date_column : str, optional
+        Column to use as datetime index. If None, 'datetime' or 'date' is used, else the
+        first column. Not needed when the file stores a pandas index (DataFrame.to_parquet).
+    columns : sequence of str
+        Price columns to read (default open, high, low, close, volume; aliases allowed).
+        Leave out columns the backtest does not use, e.g. volume, to skip reading them.
+    symbol : str, optional
+        Symbol to attach (stored in df.attrs['symbol'] if provided).
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with DatetimeIndex and the requested OHLC(V) columns.
+        Index name is 'datetime'.
+    """
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    meta = schema.pandas_metadata or {}
+    index_cols = [c for c in meta.get("index_columns", []) if isinstance(c, str)]
+    wanted = {_normalize_name(c) for c in columns}
+    names = [c for c in schema.names if c not in index_cols]
+    read_cols = [c for c in names if _normalize_name(c) in wanted]
+    date_col = None
+    if not index_cols:
+        normalized = [_normalize_name(c) for c in names]
+        date_col = date_column or next(
+            (c for c in ("datetime", "date") if c in normalized), normalized[0]
+        )
+        if date_col not in normalized:
+            date_col = normalized[0]
+        read_cols.append(names[normalized.index(date_col)])
+
+    df = _normalize_columns(pd.read_parquet(path, engine="pyarrow", columns=read_cols))
+    if date_col is not None:
+        df = df.rename(columns={date_col: "datetime"}).set_index("datetime")
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    df = df.sort_index()
+    df = df[[c for c in OHLCV if c in df.columns]]
     df.index.name = "datetime"
     if symbol is not None:
         df.attrs["symbol"] = symbol
@@ -98,7 +196,9 @@ def load_dataframe(
     Returns
     -------
     pd.DataFrame
-        Normalized DataFrame with DatetimeIndex and open, high, low, close, [volume].
+        Normalized DataFrame with DatetimeIndex and open, high, low, close, [volume] as
+        float64 in one block, each column contiguous in memory.
+        df.attrs['schema_canonical'] is True.
     """
     out = _normalize_columns(df.copy())
     if datetime_index is not None and datetime_index in out.columns:
@@ -110,6 +210,10 @@ def load_dataframe(
     out.index.name = "datetime"
     keep = [c for c in OHLCV if c in out.columns]
     out = out[[c for c in out.columns if c in keep]]
+    # One float64 block laid out column by column, so column reads are contiguous slices.
+    values = np.ascontiguousarray(out.to_numpy(dtype=np.float64).T)
+    out = pd.DataFrame(values.T, index=out.index, columns=out.columns, copy=False)
+    out.attrs[SCHEMA_CANONICAL] = True
     if symbol is not None:
         out.attrs["symbol"] = symbol
     return out
@@ -8,20 +8,22 @@ Agent hooks: Advisors (modify signals), Validators (modify orders), Observers (p
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import TYPE_CHECKING, Any, Protocol
+from datetime import datetime, tzinfo
+from typing import TYPE_CHECKING, Any, Protocol, overload, runtime_checkable
 
+import numpy as np
 import pandas as pd
 
+from backtesting._engine_numba import run_fills
 from qtos_core import Event, EventLoop, Order, Portfolio, RiskManager, Signal, Strategy
 from qtos_core.order import OrderType
 from qtos_core.signal import Side
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterator, Sequence
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarketData:
     """Payload for a market event: one bar per symbol."""
 
@@ -33,7 +35,7 @@ class MarketData:
     volume: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Record of a filled order in the backtest."""
 
@@ -44,6 +46,64 @@ class Trade:
     timestamp: datetime
 
 
+def _datetime_index(df: pd.DataFrame) -> pd.DatetimeIndex:
+    """Index of df as a DatetimeIndex (parsed if it is not one already)."""
+    return df.index if isinstance(df.index, pd.DatetimeIndex) else pd.to_datetime(df.index)
+
+
+@dataclass(frozen=True, eq=False)
+class BarBuffer:
+    """
+    OHLCV bars for one symbol stored column-wise: one NumPy array per field.
+
+    Built once per run from the input DataFrame; bars are addressed by position.
+    Timestamps are datetime64[ns] (UTC for timezone-aware input; tz keeps the zone).
+    """
+
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    tz: tzinfo | None = None
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> BarBuffer:
+        """Extract each column once; missing open/high/low fall back to close, volume to 0."""
+        close = df["close"].to_numpy(dtype=np.float64)
+        cols = df.columns
+        index = _datetime_index(df)
+        return cls(
+            ts=index.to_numpy(dtype="datetime64[ns]"),
+            open=df["open"].to_numpy(dtype=np.float64) if "open" in cols else close,
+            high=df["high"].to_numpy(dtype=np.float64) if "high" in cols else close,
+            low=df["low"].to_numpy(dtype=np.float64) if "low" in cols else close,
+            close=close,
+            volume=(
+                df["volume"].to_numpy(dtype=np.float64)
+                if "volume" in cols
+                else np.zeros(len(close), dtype=np.float64)
+            ),
+            tz=index.tz,
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def datetimes(self) -> list[datetime]:
+        """Bar timestamps as datetime objects, in the input's timezone if it had one."""
+        return _to_datetimes(self.ts, self.tz)
+
+
+def _to_datetimes(ts: np.ndarray, tz: tzinfo | None) -> list[datetime]:
+    """datetime64[ns] values as datetimes: naive if tz is None, else UTC converted to tz."""
+    if tz is None:
+        return ts.astype("datetime64[us]").tolist()
+    index = pd.DatetimeIndex(ts).tz_localize("UTC").tz_convert(tz)
+    return list(index.to_pydatetime())
+
+
 # --- Agent integration: protocols (advisors, validators, observers) ---
 
 
@@ -76,8 +136,22 @@ class Observer(Protocol):
         ...
 
 
+@runtime_checkable
+class VectorizedStrategy(Protocol):
+    """
+    Strategy whose signals depend only on prices, not on per-bar portfolio state.
+    Lets BacktestEngine.run_vectorized evaluate all bars up front.
+    """
+
+    def signals(self, close: np.ndarray) -> np.ndarray:
+        """Return one signed quantity per bar: > 0 buy, < 0 sell, 0 no trade."""
+        ...
+
+
 # --- Pass-through risk (for demos) ---
 
+_MARKET = OrderType.MARKET
+
 
 class PassThroughRiskManager(RiskManager):
     """Approves all signals as market orders. No size/risk limits."""
@@ -90,26 +164,107 @@ class PassThroughRiskManager(RiskManager):
         if isinstance(signal_or_order, Order):
             return signal_or_order
         s = signal_or_order
-        return Order(
-            symbol=s.symbol,
-            side=s.side,
-            quantity=s.quantity,
-            order_type=OrderType.MARKET,
-            limit_price=None,
-            timestamp=s.timestamp,
-        )
+        # Positional construction: cheaper than kwargs, and than dataclasses.replace.
+        return Order(s.symbol, s.side, s.quantity, _MARKET, None, s.timestamp)
 
 
 # --- Engine ---
 
 
+def _empty_timestamps() -> np.ndarray:
+    return np.empty(0, dtype="datetime64[ns]")
+
+
+def _empty_values() -> np.ndarray:
+    return np.empty(0, dtype=np.float64)
+
+
+def trade_dtype(symbol_width: int = 12) -> np.dtype:
+    """Record layout of BacktestResult.trades; side is +1 (buy) or -1 (sell)."""
+    return np.dtype(
+        [
+            ("symbol", f"U{symbol_width}"),
+            ("side", "i1"),
+            ("quantity", "f8"),
+            ("price", "f8"),
+            ("timestamp", "datetime64[ns]"),
+        ]
+    )
+
+
+def _empty_trades(n: int = 0, symbol_width: int = 12) -> np.recarray:
+    return np.recarray(n, dtype=trade_dtype(symbol_width))
+
+
+def _to_datetime64(ts: datetime) -> np.datetime64:
+    """datetime as datetime64[ns]; timezone-aware values are stored as UTC."""
+    return np.datetime64(pd.Timestamp(ts).value, "ns")
+
+
+@dataclass(frozen=True, eq=False)
+class EquityCurve:
+    """
+    Equity curve as two aligned arrays: bar timestamps (datetime64[ns], UTC for
+    timezone-aware input) and portfolio values (float64). Iterates, indexes and slices as
+    (datetime, value) pairs like the list form, with datetimes in tz when it is set.
+    """
+
+    timestamps: np.ndarray = field(default_factory=_empty_timestamps)
+    values: np.ndarray = field(default_factory=_empty_values)
+    tz: tzinfo | None = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[tuple[datetime, float]]:
+        return zip(_to_datetimes(self.timestamps, self.tz), self.values.tolist())
+
+    @overload
+    def __getitem__(self, i: int) -> tuple[datetime, float]: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[tuple[datetime, float]]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(zip(_to_datetimes(self.timestamps[i], self.tz), self.values[i].tolist()))
+        i = range(len(self.values))[i]  # negative indices and IndexError as for a list
+        (ts,) = _to_datetimes(self.timestamps[i : i + 1], self.tz)
+        return ts, float(self.values[i])
+
+
 @dataclass
 class BacktestResult:
-    """Result of a backtest run: portfolio, trades, equity curve."""
+    """
+    Result of a backtest run: portfolio, trades, equity curve.
+
+    trades is a record array (see trade_dtype), one row per fill in fill order; rows
+    support attribute access (trades[0].price) and columns are arrays (trades.price).
+    """
 
     portfolio: Portfolio
-    trades: list[Trade] = field(default_factory=list)
-    equity_curve: list[tuple[datetime, float]] = field(default_factory=list)
+    trades: np.recarray = field(default_factory=_empty_trades)
+    equity_curve: EquityCurve = field(default_factory=EquityCurve)
+
+    def trades_as_dataclasses(self) -> list[Trade]:
+        """Trades as Trade objects (timestamps as naive datetimes, UTC for tz-aware data)."""
+        t = self.trades
+        return [
+            Trade(
+                symbol=symbol,
+                side=Side.BUY if side > 0 else Side.SELL,
+                quantity=quantity,
+                price=price,
+                timestamp=ts,
+            )
+            for symbol, side, quantity, price, ts in zip(
+                t.symbol.tolist(),
+                t.side.tolist(),
+                t.quantity.tolist(),
+                t.price.tolist(),
+                t.timestamp.astype("datetime64[us]").tolist(),
+            )
+        ]
 
 
 class BacktestEngine:
@@ -134,103 +289,161 @@ class BacktestEngine:
         self.advisors: list[Advisor] = list(advisors)
         self.validators: list[Validator] = list(validators)
         self.observers: list[Observer] = list(observers)
-        self._trades: list[Trade] = []
-        self._equity_curve: list[tuple[datetime, float]] = []
-        self._last_prices: dict[str, float] = {}
-
-    def _events_from_dataframe(
+        # Fills recorded by row; sized to the data in run() and grown if a bar fills twice.
+        self._trade_buf: np.recarray = _empty_trades()
+        self._n_trades = 0
+        # Equity values written by bar index; sized to the data in run().
+        self._equity_values: np.ndarray = _empty_values()
+        self._equity_i = 0
+        # Last close per symbol, aligned with self.portfolio.positions_arr by symbol id,
+        # so the per-bar equity snapshot is one dot product.
+        self._prices_arr: np.ndarray = _empty_values()
+
+    def _events_from_bars(
         self,
-        df: pd.DataFrame,
+        bars: BarBuffer,
         symbol: str,
-    ) -> list[Event]:
-        """Build a list of Event with MarketData payload from OHLCV DataFrame."""
-        events: list[Event] = []
-        for ts, row in df.iterrows():
-            ts_dt = ts.to_pydatetime() if hasattr(ts, "to_pydatetime") else datetime.fromisoformat(str(ts))
-            payload = MarketData(
-                symbol=symbol,
-                open=float(row.get("open", row.get("close", 0))),
-                high=float(row.get("high", row.get("close", 0))),
-                low=float(row.get("low", row.get("close", 0))),
-                close=float(row["close"]),
-                volume=float(row.get("volume", 0)),
-            )
-            events.append(Event(timestamp=ts_dt, payload=payload))
-        return events
+    ) -> Iterator[Event]:
+        """Yield one Event with MarketData payload per bar, built as the loop consumes it."""
+        for ts, o, h, lo, c, v in zip(
+            bars.datetimes(),
+            bars.open.tolist(),
+            bars.high.tolist(),
+            bars.low.tolist(),
+            bars.close.tolist(),
+            bars.volume.tolist(),
+        ):
+            yield Event(timestamp=ts, payload=MarketData(symbol, o, h, lo, c, v))
+
+    def _symbol_id(self, symbol: str) -> int:
+        """Portfolio id of symbol; grows the price array alongside the position array."""
+        idx = self.portfolio.positions.symbol_id(symbol)
+        self._sync_prices()
+        return idx
+
+    def _sync_prices(self) -> np.ndarray:
+        """Zero-pad the price array to the position array's length; return it."""
+        prices = self._prices_arr
+        cap = len(self.portfolio.positions_arr)
+        if len(prices) < cap:
+            prices = self._prices_arr = np.concatenate((prices, np.zeros(cap - len(prices))))
+        return prices
+
+    def _reset_prices(self) -> None:
+        """Clear last known prices at the start of a run."""
+        self._prices_arr = np.zeros(len(self.portfolio.positions_arr), dtype=np.float64)
 
     def _portfolio_value(self) -> float:
         """Current portfolio value: cash + positions at last known prices."""
-        total = self.portfolio.cash
-        for sym, qty in self.portfolio.positions.items():
-            total += qty * self._last_prices.get(sym, 0.0)
-        return total
+        qty = self.portfolio.positions_arr
+        prices = self._prices_arr
+        if len(prices) != len(qty):
+            # A hook added a symbol (portfolio.update_position) since prices were last sized.
+            prices = self._sync_prices()[: len(qty)]
+        return self.portfolio.cash + float(qty @ prices)
+
+    def _fill(self, order: Order, timestamp: datetime) -> tuple[float, float] | None:
+        """Fill order at the symbol's current close; record it and return (quantity, price)."""
+        pf = self.portfolio
+        idx = pf.symbols.get(order.symbol)
+        price = float(self._prices_arr[idx]) if idx is not None else 0.0
+        if price <= 0:
+            return None
+        positions = pf.positions_arr
+        qty = order.quantity
+        if order.side == Side.BUY:
+            if pf.cash < qty * price:
+                return None
+            pf.cash -= qty * price
+            positions[idx] += qty
+            side = 1
+        else:
+            # Sells are capped at the held position.
+            qty = min(qty, float(positions[idx]))
+            if qty <= 0:
+                return None
+            pf.cash += qty * price
+            positions[idx] -= qty
+            side = -1
+
+        n = self._n_trades
+        buf = self._trade_buf
+        width = buf.dtype["symbol"].itemsize // 4
+        if n == len(buf) or len(order.symbol) > width:
+            grown = _empty_trades(max(2 * len(buf), 8), max(width, len(order.symbol)))
+            grown[:n] = buf[:n]
+            buf = self._trade_buf = grown
+        buf[n] = (order.symbol, side, qty, price, _to_datetime64(order.timestamp or timestamp))
+        self._n_trades = n + 1
+        return qty, price
 
     def _handle_event(self, event: Event) -> None:
-        """Process one event: strategy → advisors → risk → validators → fill → observers."""
-        payload = event.payload
-        if isinstance(payload, MarketData):
-            self._last_prices[payload.symbol] = payload.close
-        else:
-            return
+        """
+        Process one market event: strategy → advisors → risk → validators → fill → observers.
+
+        Subscribed for MarketData payloads only, so other events never reach it.
+        """
+        payload: MarketData = event.payload
+        idx = self._symbol_id(payload.symbol)
+        self._prices_arr[idx] = payload.close
+
+        # Bind hot attributes once; this runs for every bar.
+        pf = self.portfolio
+        check = self.risk_manager.check
+        validators = self.validators
+        observers = self.observers
+        fill = self._fill
 
         # Strategy
-        signals = self.strategy.on_event(event, self.portfolio)
+        signals = self.strategy.on_event(event, pf)
 
         # Advisors (modify signals)
         for advisor in self.advisors:
-            signals = advisor(signals, event, self.portfolio)
+            signals = advisor(signals, event, pf)
 
         # Risk + validators → fill
         for sig in signals:
-            order = self.risk_manager.check(sig, self.portfolio)
+            order = check(sig, pf)
             if order is None:
                 continue
-            for validator in self.validators:
-                order = validator(order, self.portfolio)
+            if validators:
+                for validator in validators:
+                    order = validator(order, pf)
+                    if order is None:
+                        break
                 if order is None:
-                    break
-            if order is None:
-                continue
+                    continue
 
             # Fill at current close (same bar)
-            price = self._last_prices.get(order.symbol, 0.0)
-            if price <= 0:
-                continue
-            cost = order.quantity * price
-            if order.side == Side.BUY:
-                if self.portfolio.cash < cost:
-                    continue
-                self.portfolio.cash -= cost
-                self.portfolio.update_position(order.symbol, order.quantity)
-            else:
-                pos = self.portfolio.position(order.symbol)
-                if pos < order.quantity:
-                    order = Order(
-                        symbol=order.symbol,
-                        side=order.side,
-                        quantity=pos,
-                        order_type=order.order_type,
-                        limit_price=order.limit_price,
-                        timestamp=order.timestamp,
-                    )
-                    if order.quantity <= 0:
-                        continue
-                self.portfolio.cash += order.quantity * price
-                self.portfolio.update_position(order.symbol, -order.quantity)
-
-            trade = Trade(
-                symbol=order.symbol,
-                side=order.side,
-                quantity=order.quantity,
-                price=price,
-                timestamp=order.timestamp or event.timestamp,
-            )
-            self._trades.append(trade)
-            for obs in self.observers:
-                obs(trade, self.portfolio)
+            filled = fill(order, event.timestamp)
+            if filled is not None and observers:
+                trade = Trade(
+                    symbol=order.symbol,
+                    side=order.side,
+                    quantity=filled[0],
+                    price=filled[1],
+                    timestamp=order.timestamp or event.timestamp,
+                )
+                for obs in observers:
+                    obs(trade, pf)
 
         # Equity snapshot
-        self._equity_curve.append((event.timestamp, self._portfolio_value()))
+        self._equity_values[self._equity_i] = self._portfolio_value()
+        self._equity_i += 1
+
+    def _handle_event_bare(self, event: Event) -> None:
+        """_handle_event specialized for runs without advisors, validators or observers."""
+        payload: MarketData = event.payload
+        idx = self._symbol_id(payload.symbol)
+        self._prices_arr[idx] = payload.close
+        pf = self.portfolio
+        check = self.risk_manager.check
+        for sig in self.strategy.on_event(event, pf):
+            order = check(sig, pf)
+            if order is not None:
+                self._fill(order, event.timestamp)
+        self._equity_values[self._equity_i] = self._portfolio_value()
+        self._equity_i += 1
 
     def run(
         self,
@@ -252,18 +465,134 @@ class BacktestEngine:
         BacktestResult
             Portfolio, trades, and equity curve.
         """
-        self._trades = []
-        self._equity_curve = []
-        self._last_prices = {}
+        self._equity_values = np.empty(len(data), dtype=np.float64)
+        self._equity_i = 0
+        self._reset_prices()
         sym = symbol or (data.attrs.get("symbol", "UNKNOWN") if hasattr(data, "attrs") else "UNKNOWN")
+        self._trade_buf = _empty_trades(len(data), max(12, len(sym)))
+        self._n_trades = 0
 
-        events = self._events_from_dataframe(data, sym)
+        bars = BarBuffer.from_dataframe(data)
         loop = EventLoop()
-        loop.subscribe(self._handle_event)
-        loop.run(events)
+        # Hooks are plain lists and may change between runs, so pick the handler here.
+        hooked = self.advisors or self.validators or self.observers
+        loop.subscribe_for(MarketData, self._handle_event if hooked else self._handle_event_bare)
+        loop.run(self._events_from_bars(bars, sym))
+
+        n = self._equity_i
+        return BacktestResult(
+            portfolio=Portfolio(cash=self.portfolio.cash, positions=dict(self.portfolio.positions)),
+            trades=self._trade_buf[: self._n_trades].copy(),
+            equity_curve=EquityCurve(
+                timestamps=bars.ts[:n],
+                values=self._equity_values[:n].copy(),
+                tz=bars.tz,
+            ),
+        )
+
+    def run_vectorized(
+        self,
+        data: pd.DataFrame,
+        symbol: str | None = None,
+    ) -> BacktestResult:
+        """
+        Run a backtest by asking the strategy for all signals up front.
+
+        Used when the strategy implements VectorizedStrategy.signals(close), the risk
+        manager is PassThroughRiskManager and no advisors or validators are registered;
+        fills then go through run_signals in one pass. Otherwise falls back to run().
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame with DatetimeIndex and open, high, low, close [, volume].
+        symbol : str, optional
+            Symbol for market payloads. If None, uses data.attrs.get('symbol', 'UNKNOWN').
+
+        Returns
+        -------
+        BacktestResult
+            Portfolio, trades, and equity curve.
+        """
+        if (
+            not isinstance(self.strategy, VectorizedStrategy)
+            or type(self.risk_manager) is not PassThroughRiskManager
+            or self.advisors
+            or self.validators
+        ):
+            return self.run(data, symbol)
+        closes = data["close"].to_numpy(dtype=np.float64)
+        signed = np.asarray(self.strategy.signals(closes), dtype=np.float64)
+        return self.run_signals(data, np.sign(signed), np.abs(signed), symbol)
+
+    def run_signals(
+        self,
+        data: pd.DataFrame,
+        sides: Sequence[int] | np.ndarray,
+        quantities: Sequence[float] | np.ndarray,
+        symbol: str | None = None,
+    ) -> BacktestResult:
+        """
+        Run a backtest from precomputed per-bar signals instead of calling the strategy.
+
+        For signals that do not depend on portfolio state. Fills, cash and equity are
+        computed in a single compiled pass (numba when installed) with the same rules
+        as run(): fill at the bar close, buys need cash, sells are capped at the position.
+        Advisors, risk manager and validators are not applied; observers are called for
+        each fill after the pass, with the final portfolio.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame with DatetimeIndex and a close column.
+        sides : array-like of int
+            Per bar: +1 buy, -1 sell, 0 no signal. Same length as data.
+        quantities : array-like of float
+            Per bar: requested quantity. Same length as data.
+        symbol : str, optional
+            Traded symbol. If None, uses data.attrs.get('symbol', 'UNKNOWN').
+
+        Returns
+        -------
+        BacktestResult
+            Portfolio, trades, and equity curve.
+        """
+        sym = symbol or (data.attrs.get("symbol", "UNKNOWN") if hasattr(data, "attrs") else "UNKNOWN")
+        bars = BarBuffer.from_dataframe(data)
+        closes = bars.close
+        side_arr = np.asarray(sides, dtype=np.int8)
+        qty_arr = np.asarray(quantities, dtype=np.float64)
+        if side_arr.shape != closes.shape or qty_arr.shape != closes.shape:
+            raise ValueError("sides and quantities must have one entry per bar of data")
+
+        cash0 = float(self.portfolio.cash)
+        pos0 = float(self.portfolio.position(sym))
+        cash, pos, fill_qty, equity = run_fills(side_arr, qty_arr, closes, cash0, pos0)
+        self.portfolio.cash = float(cash)
+        self.portfolio.positions[sym] = float(pos)
+
+        filled = np.flatnonzero(fill_qty)
+        trades = _empty_trades(len(filled), max(12, len(sym)))
+        trades.symbol = sym
+        trades.side = np.where(side_arr[filled] > 0, 1, -1)
+        trades.quantity = fill_qty[filled]
+        trades.price = closes[filled]
+        trades.timestamp = bars.ts[filled]
+        if self.observers:
+            timestamps = bars.datetimes()
+            for i in filled.tolist():
+                trade = Trade(
+                    symbol=sym,
+                    side=Side.BUY if side_arr[i] > 0 else Side.SELL,
+                    quantity=float(fill_qty[i]),
+                    price=float(closes[i]),
+                    timestamp=timestamps[i],
+                )
+                for obs in self.observers:
+                    obs(trade, self.portfolio)
 
         return BacktestResult(
             portfolio=Portfolio(cash=self.portfolio.cash, positions=dict(self.portfolio.positions)),
-            trades=list(self._trades),
-            equity_curve=list(self._equity_curve),
+            trades=trades,
+            equity_curve=EquityCurve(timestamps=bars.ts, values=equity, tz=bars.tz),
         )
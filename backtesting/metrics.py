@@ -12,6 +12,9 @@ from typing import Sequence
 
 import numpy as np
 
+from backtesting._engine_numba import NUMBA_AVAILABLE, metric_pass
+from backtesting.engine import EquityCurve
+
 
 @dataclass
 class Metrics:
@@ -29,7 +32,7 @@ class Metrics:
 
 def compute_metrics(
     initial_value: float,
-    equity_curve: Sequence[tuple[datetime, float]],
+    equity_curve: Sequence[tuple[datetime, float]] | EquityCurve,
     *,
     trading_days_per_year: int = 252,
     risk_free_rate: float = 0.0,
@@ -41,8 +44,9 @@ def compute_metrics(
     ----------
     initial_value : float
         Starting portfolio value.
-    equity_curve : sequence of (datetime, value)
-        Time-ordered (timestamp, portfolio value) pairs.
+    equity_curve : sequence of (datetime, value) or EquityCurve
+        Time-ordered (timestamp, portfolio value) pairs. An EquityCurve (as returned
+        by BacktestEngine) is used directly without unpacking into pairs.
     trading_days_per_year : int
         Used for annualizing returns and Sharpe (default 252).
     risk_free_rate : float
@@ -66,7 +70,11 @@ def compute_metrics(
             max_drawdown_pct=0.0,
         )
 
-    values = np.array([v for _, v in equity_curve], dtype=float)
+    is_arrays = isinstance(equity_curve, EquityCurve)
+    if is_arrays:
+        values = np.asarray(equity_curve.values, dtype=float)
+    else:
+        values = np.array([v for _, v in equity_curve], dtype=float)
     final_value = float(values[-1])
     total_pnl = final_value - initial_value
     total_return_pct = (total_pnl / initial_value * 100.0) if initial_value else 0.0
@@ -75,6 +83,10 @@ def compute_metrics(
     n = len(values)
     if n < 2:
         years = 1e-10
+    elif is_arrays:
+        ts = equity_curve.timestamps
+        days = float((ts[-1] - ts[0]) / np.timedelta64(1, "D"))
+        years = max(days / trading_days_per_year, 1e-10)
     else:
         t0 = equity_curve[0][0]
         t1 = equity_curve[-1][0]
@@ -87,20 +99,30 @@ def compute_metrics(
     cagr = (final_value / initial_value) ** (1.0 / years) - 1.0 if initial_value > 0 else 0.0
     cagr *= 100.0  # as percentage
 
-    # Daily returns for Sharpe
-    returns = np.diff(values) / np.maximum(values[:-1], 1e-14)
-    if len(returns) == 0:
-        sharpe_ratio = 0.0
+    rf_per_period = risk_free_rate / trading_days_per_year
+    if NUMBA_AVAILABLE:
+        # Fused compiled pass: returns stats and drawdown without intermediate arrays.
+        mean, m2, n_ret, max_drawdown, peak_at_mdd = metric_pass(values, rf_per_period)
+        std = np.sqrt(m2 / n_ret) if n_ret else 0.0
+        sharpe_ratio = (mean / std * np.sqrt(trading_days_per_year)) if std > 1e-14 else 0.0
+        max_dd_pct = (max_drawdown / peak_at_mdd * 100.0) if peak_at_mdd > 0 else 0.0
     else:
-        excess = returns - (risk_free_rate / trading_days_per_year)
-        std = np.std(excess)
-        sharpe_ratio = (np.mean(excess) / std * np.sqrt(trading_days_per_year)) if std > 1e-14 else 0.0
-
-    # Max drawdown
-    peak = np.maximum.accumulate(values)
-    drawdowns = peak - values
-    max_drawdown = float(np.max(drawdowns))
-    max_dd_pct = (max_drawdown / peak[np.argmax(drawdowns)] * 100.0) if np.any(peak > 0) else 0.0
+        # Daily returns for Sharpe
+        returns = np.diff(values) / np.maximum(values[:-1], 1e-14)
+        if len(returns) == 0:
+            sharpe_ratio = 0.0
+        else:
+            excess = returns - rf_per_period
+            std = np.std(excess)
+            sharpe_ratio = (
+                (np.mean(excess) / std * np.sqrt(trading_days_per_year)) if std > 1e-14 else 0.0
+            )
+
+        # Max drawdown
+        peak = np.maximum.accumulate(values)
+        idx = int(np.argmax(peak - values))
+        max_drawdown = float(peak[idx] - values[idx])
+        max_dd_pct = (max_drawdown / peak[idx] * 100.0) if peak[idx] > 0 else 0.0
 
     return Metrics(
         initial_value=initial_value,
@@ -37,7 +37,7 @@ def _prices_to_dataframe(symbols: list[str], prices: dict[str, float]) -> pd.Dat
 
 def print_fill_observer(trade: ExecutedTrade, portfolio: Portfolio) -> None:
     """Observer: post-trade log."""
-    print(f"  [Observer] FILL {trade.side.value} {trade.quantity} {trade.symbol} @ {trade.price:.2f}")
+    print(f"  [Observer] FILL {trade.side} {trade.quantity} {trade.symbol} @ {trade.price:.2f}")
 
 
 def main() -> None:
@@ -65,7 +65,7 @@ def main() -> None:
     state = paper_broker.get_portfolio()
     print(f"Portfolio: cash={state.cash:.2f}, positions={state.positions}")
     for order, status in paper_broker.get_order_log():
-        print(f"  Order: {order.symbol} {order.side.value} {order.quantity} -> {status.status.value}")
+        print(f"  Order: {order.symbol} {order.side} {order.quantity} -> {status.status}")
 
     # --- 2) Switch to LiveBrokerAdapter (sandbox=True) ---
     print("\n=== LiveBrokerAdapter (sandbox mode) ===\n")
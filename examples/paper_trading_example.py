@@ -48,7 +48,7 @@ def max_size_validator(order: Order, portfolio: Portfolio) -> Order | None:
 
 def print_fill_observer(trade: ExecutedTrade, portfolio: Portfolio) -> None:
     """Observer: post-trade log (e.g. journal, metrics)."""
-    print(f"  [Observer] FILL {trade.side.value} {trade.quantity} {trade.symbol} @ {trade.price:.2f}")
+    print(f"  [Observer] FILL {trade.side} {trade.quantity} {trade.symbol} @ {trade.price:.2f}")
 
 
 def main() -> None:
@@ -78,7 +78,7 @@ def main() -> None:
     state = broker.get_portfolio()
     print(f"Portfolio: cash={state.cash:.2f}, positions={state.positions}")
     for order, status in broker.get_order_log():
-        print(f"  Order log: {order.symbol} {order.side.value} {order.quantity} -> {status.status.value}")
+        print(f"  Order log: {order.symbol} {order.side} {order.quantity} -> {status.status}")
 
     print("\n--- Paper trading: run_once (second bar, no new signal from buy-and-hold) ---")
     latest_prices[symbol] = 402.0
@@ -4,7 +4,7 @@ Event loop: single-threaded, deterministic event processing.
 Dispatches events to registered handlers. No async; order of handlers is explicit.
 """
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from typing import TypeVar
 
 from qtos_core.events import Event
@@ -19,18 +19,59 @@ class EventLoop:
     """
 
     def __init__(self) -> None:
-        self._handlers: list[Callable[[Event], None]] = []
+        # (payload type or None for every event, handler), in registration order.
+        self._subscriptions: list[tuple[type | None, Callable[[Event], None]]] = []
+        # Handlers per concrete payload type, built on first use; cleared on subscribe.
+        self._routes: dict[type, tuple[Callable[[Event], None], ...]] = {}
 
     def subscribe(self, handler: Callable[[Event], None]) -> None:
         """Register a handler to be called for every event."""
-        self._handlers.append(handler)
+        self._subscriptions.append((None, handler))
+        self._routes.clear()
+
+    def subscribe_for(self, payload_type: type, handler: Callable[[Event], None]) -> None:
+        """
+        Register a handler called only for events whose payload is a payload_type
+        (or a subclass). Relative order with other handlers is registration order.
+        """
+        self._subscriptions.append((payload_type, handler))
+        self._routes.clear()
+
+    def _route(self, payload_type: type) -> tuple[Callable[[Event], None], ...]:
+        """Handlers for payload_type, in registration order (cached)."""
+        handlers = self._routes.get(payload_type)
+        if handlers is None:
+            handlers = self._routes[payload_type] = tuple(
+                h for t, h in self._subscriptions if t is None or issubclass(payload_type, t)
+            )
+        return handlers
 
     def dispatch(self, event: Event) -> None:
-        """Process one event through all handlers in order."""
-        for h in self._handlers:
+        """Process one event through its handlers in order."""
+        for h in self._route(type(event.payload)):
             h(event)
 
-    def run(self, events: list[Event]) -> None:
-        """Process a sequence of events in order (e.g. backtest)."""
+    def run(self, events: Iterable[Event]) -> None:
+        """
+        Process a sequence of events in order (e.g. backtest).
+
+        Accepts any iterable, so events can be streamed from a generator.
+        """
+        if len(self._subscriptions) == 1:
+            # Common case (one engine handler): call it directly, skipping dispatch per event.
+            payload_type, handler = self._subscriptions[0]
+            if payload_type is None:
+                for event in events:
+                    handler(event)
+            else:
+                for event in events:
+                    if isinstance(event.payload, payload_type):
+                        handler(event)
+            return
+        routes = self._routes
+        route = self._route
         for event in events:
-            self.dispatch(event)
+            payload_type = type(event.payload)
+            handlers = routes.get(payload_type) or route(payload_type)
+            for h in handlers:
+                h(event)
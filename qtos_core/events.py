@@ -10,7 +10,7 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Event:
     """Base type for all events. Subclass to define event kinds."""
 
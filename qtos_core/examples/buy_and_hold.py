@@ -15,6 +15,11 @@ from qtos_core.signal import Signal, Side
 from qtos_core.strategy import Strategy
 
 
+def _no_signals(event: Event, portfolio: Portfolio | None = None) -> list[Signal]:
+    """on_event after the first fire: nothing more to do."""
+    return []
+
+
 class BuyAndHoldStrategy(Strategy):
     """
     On first event, emit one buy signal for the configured symbol.
@@ -34,6 +39,8 @@ class BuyAndHoldStrategy(Strategy):
         if self._fired:
             return []
         self._fired = True
+        # Later events skip the _fired check entirely.
+        self.on_event = _no_signals
         ts = event.timestamp if hasattr(event, "timestamp") else datetime.now()
         return [
             Signal(
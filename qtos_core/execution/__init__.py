@@ -6,13 +6,16 @@ Agent hooks: Advisors, Validators, Observers (compatible with backtesting protoc
 """
 
 from qtos_core.execution.broker import BrokerAdapter
+from qtos_core.execution.coalescing import CoalescingBrokerProxy
 from qtos_core.execution.live import LiveBrokerAdapter
 from qtos_core.execution.paper import PaperBrokerAdapter
 from qtos_core.execution.engine import ExecutionEngine, RejectedOrderLog
+from qtos_core.execution.snapshot import DataFrameSnapshot, DictSnapshot, MarketSnapshot
 from qtos_core.execution.types import ExecutedTrade, OrderStatus, OrderStatusKind, PortfolioState
 
 __all__ = [
     "BrokerAdapter",
+    "CoalescingBrokerProxy",
     "OrderStatus",
     "OrderStatusKind",
     "PortfolioState",
@@ -21,4 +24,7 @@ __all__ = [
     "ExecutionEngine",
     "ExecutedTrade",
     "RejectedOrderLog",
+    "MarketSnapshot",
+    "DictSnapshot",
+    "DataFrameSnapshot",
 ]
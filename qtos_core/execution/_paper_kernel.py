@@ -0,0 +1,85 @@
+"""
+Compiled fill kernel for PaperBrokerAdapter.submit_orders.
+
+JIT-compiled with numba when it is installed (`pip install qtos-core[fast]`); otherwise
+the same function runs as plain Python with identical results. The paper adapter only
+imports this module for large batches when numba is available.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit: return the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+# Result codes, one per order.
+FILLED = 0
+NO_DATA = 1
+INVALID_PRICE = 2
+NO_CASH = 3
+NO_POSITION = 4
+
+
+@njit(cache=True)
+def simulate_fills(price, priced, qty, side, sym_id, cash, pos):
+    """
+    Apply a batch of market orders in order, with PaperBrokerAdapter.submit_order's rules.
+
+    price/priced are per symbol id (priced is False where there is no quote); qty, side
+    (+1 buy, -1 sell) and sym_id are per order. pos holds the position per symbol id and
+    is updated in place.
+
+    Returns (codes, cash): codes[i] is FILLED or the rejection reason for order i.
+    """
+    n = len(qty)
+    codes = np.empty(n, dtype=np.int8)
+    for i in range(n):
+        j = sym_id[i]
+        if not priced[j]:
+            codes[i] = NO_DATA
+            continue
+        p = price[j]
+        if p <= 0:
+            codes[i] = INVALID_PRICE
+            continue
+        q = qty[i]
+        cost = q * p
+        if side[i] > 0:
+            if cash < cost:
+                codes[i] = NO_CASH
+                continue
+            cash -= cost
+            pos[j] += q
+        else:
+            if pos[j] < q:
+                codes[i] = NO_POSITION
+                continue
+            cash += cost
+            pos[j] -= q
+        codes[i] = FILLED
+    return codes, cash
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from the on-disk cache) now, so the first real batch does not pay for it.
+    simulate_fills(
+        np.ones(1),
+        np.ones(1, dtype=np.bool_),
+        np.ones(1),
+        np.ones(1, dtype=np.int8),
+        np.zeros(1, dtype=np.intp),
+        1.0,
+        np.zeros(1),
+    )
@@ -1,13 +1,18 @@
 """
 Broker abstraction layer.
 
-BrokerAdapter ABC: submit_order, get_portfolio, get_market_data.
+BrokerAdapter ABC: submit_order(s), get_portfolio, get_market_data.
 Future live adapters (Alpaca, IBKR) implement this interface; paper adapter implements it for simulation.
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from functools import cache
 from typing import TYPE_CHECKING
 
 from qtos_core.order import Order
@@ -18,6 +23,23 @@ if TYPE_CHECKING:
     import pandas as pd
 
 
+@cache
+def _takes_now(cls: type) -> bool:
+    """
+    Whether cls.submit_order accepts the `now` keyword. Adapters written before it was
+    added define submit_order(self, order) and are called without it.
+    """
+    params = inspect.signature(cls.submit_order).parameters.values()
+    return any(p.name == "now" or p.kind is p.VAR_KEYWORD for p in params)
+
+
+def _submit_one(broker: BrokerAdapter, order: Order, now: datetime | None) -> OrderStatus:
+    """broker.submit_order(order, now=now), leaving out now for adapters without it."""
+    if _takes_now(type(broker)):
+        return broker.submit_order(order, now=now)
+    return broker.submit_order(order)
+
+
 class BrokerAdapter(ABC):
     """
     Abstract broker adapter. Same interface for paper and live execution.
@@ -25,14 +47,39 @@ class BrokerAdapter(ABC):
     """
 
     @abstractmethod
-    def submit_order(self, order: Order) -> OrderStatus:
+    def submit_order(self, order: Order, *, now: datetime | None = None) -> OrderStatus:
         """
         Submit an order. Returns status (filled, rejected, etc.).
         In paper mode: simulates fill at latest market price.
         In live mode: sends to broker and returns when acked/filled (implementation-dependent).
+        now: timestamp for the returned status; None means datetime.now() at submission.
         """
         ...
 
+    def submit_orders(
+        self, orders: Sequence[Order], *, now: datetime | None = None
+    ) -> list[OrderStatus]:
+        """
+        Submit several orders in one call. Returns one status per order, in order.
+        Default: submit_order per item, all stamped with one `now` (taken once if None).
+        Live adapters should override this with a bulk request so a cycle costs one
+        broker round-trip instead of one per order. Adapters whose submit_order does not
+        take `now` are called without it and stamp statuses themselves.
+        """
+        if not _takes_now(type(self)):
+            return [self.submit_order(order) for order in orders]
+        if now is None:
+            now = datetime.now()
+        return [self.submit_order(order, now=now) for order in orders]
+
+    def prime_quotes(self, prices: Mapping[str, float]) -> None:
+        """
+        Hand the adapter the latest prices (symbol -> price) fetched for this cycle,
+        so it can price fills without fetching market data again. ExecutionEngine
+        calls it with {} when the cycle ends, so quotes never outlive their cycle.
+        Default: ignored.
+        """
+
     @abstractmethod
     def get_portfolio(self) -> PortfolioState:
         """Return current portfolio snapshot (cash + positions)."""
@@ -48,6 +95,20 @@ class BrokerAdapter(ABC):
         """
         ...
 
+    async def aget_portfolio(self) -> PortfolioState:
+        """
+        Async get_portfolio. Default: run get_portfolio in a worker thread.
+        Adapters with an async client should override this.
+        """
+        return await asyncio.to_thread(self.get_portfolio)
+
+    async def aget_market_data(self, symbols: list[str]) -> pd.DataFrame:
+        """
+        Async get_market_data. Default: run get_market_data in a worker thread.
+        Adapters with an async client should override this.
+        """
+        return await asyncio.to_thread(self.get_market_data, symbols)
+
 
 # ---------------------------------------------------------------------------
 # Placeholder for future live broker adapters (do not modify backtesting).
@@ -57,7 +118,7 @@ class BrokerAdapter(ABC):
 # class AlpacaBrokerAdapter(BrokerAdapter):
 #     """Live adapter for Alpaca. Requires ALPACA_API_KEY, ALPACA_SECRET_KEY."""
 #
-#     def submit_order(self, order: Order) -> OrderStatus:
+#     def submit_order(self, order: Order, *, now: datetime | None = None) -> OrderStatus:
 #         # Call Alpaca API; map response to OrderStatus
 #         raise NotImplementedError("Alpaca adapter not implemented")
 #
@@ -70,7 +131,7 @@ class BrokerAdapter(ABC):
 # class IBKRBrokerAdapter(BrokerAdapter):
 #     """Live adapter for Interactive Brokers. Requires TWS/Gateway and ib_insync or similar."""
 #
-#     def submit_order(self, order: Order) -> OrderStatus:
+#     def submit_order(self, order: Order, *, now: datetime | None = None) -> OrderStatus:
 #         raise NotImplementedError("IBKR adapter not implemented")
 #
 #     def get_portfolio(self) -> PortfolioState:
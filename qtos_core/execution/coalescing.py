@@ -0,0 +1,128 @@
+"""
+Coalescing broker proxy: share one get_portfolio() fetch between concurrent callers.
+
+Wraps any BrokerAdapter. Useful when several threads (strategy loop, watchdog,
+reporting) poll the same broker: callers within a short TTL get the cached snapshot,
+and callers that arrive while a fetch is in flight wait for it instead of issuing
+their own request.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from qtos_core.execution.broker import BrokerAdapter, _submit_one
+from qtos_core.execution.types import OrderStatus, PortfolioState
+from qtos_core.order import Order
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(slots=True)
+class _Flight:
+    """One in-flight get_portfolio() call; followers wait on done."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    result: PortfolioState | None = None
+    error: BaseException | None = None
+
+
+class CoalescingBrokerProxy(BrokerAdapter):
+    """
+    BrokerAdapter wrapper with a short-TTL, single-flight get_portfolio().
+
+    - A snapshot younger than ttl seconds (default 0.05) is returned as is.
+    - Otherwise the first caller fetches from the wrapped broker; concurrent callers
+      wait for that fetch and share its result (or its exception).
+    - Submitting orders invalidates the cache, so a read after a fill always reaches
+      the broker.
+
+    Callers share the returned PortfolioState: treat it as read-only. All other
+    methods (and attributes such as close()) are delegated to the wrapped broker.
+    """
+
+    def __init__(self, broker: BrokerAdapter, *, ttl: float = 0.05) -> None:
+        self._broker = broker
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._cached: tuple[float, PortfolioState] | None = None
+        self._flight: _Flight | None = None
+        # Bumped on invalidate(); a fetch that started before it is not cached.
+        self._generation = 0
+
+    @property
+    def broker(self) -> BrokerAdapter:
+        """The wrapped adapter."""
+        return self._broker
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot; the next get_portfolio() fetches from the broker."""
+        with self._lock:
+            self._cached = None
+            self._generation += 1
+
+    def get_portfolio(self) -> PortfolioState:
+        """Cached or shared portfolio snapshot (see class docstring)."""
+        with self._lock:
+            cached = self._cached
+            if cached is not None and monotonic() - cached[0] < self._ttl:
+                return cached[1]
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+                generation = self._generation
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = self._broker.get_portfolio()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flight = None
+                if flight.error is None and generation == self._generation:
+                    self._cached = (monotonic(), flight.result)
+            flight.done.set()
+        return flight.result
+
+    def submit_order(self, order: Order, *, now: datetime | None = None) -> OrderStatus:
+        """Submit via the wrapped broker and invalidate the portfolio cache."""
+        try:
+            return _submit_one(self._broker, order, now)
+        finally:
+            self.invalidate()
+
+    def submit_orders(
+        self, orders: Sequence[Order], *, now: datetime | None = None
+    ) -> list[OrderStatus]:
+        """Submit a batch via the wrapped broker and invalidate the portfolio cache."""
+        try:
+            return self._broker.submit_orders(orders, now=now)
+        finally:
+            self.invalidate()
+
+    def prime_quotes(self, prices: Mapping[str, float]) -> None:
+        self._broker.prime_quotes(prices)
+
+    def get_market_data(self, symbols: list[str]) -> pd.DataFrame:
+        return self._broker.get_market_data(symbols)
+
+    async def aget_market_data(self, symbols: list[str]) -> pd.DataFrame:
+        return await self._broker.aget_market_data(symbols)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the proxy (e.g. close, get_order_log).
+        if name == "_broker":
+            raise AttributeError(name)
+        return getattr(self._broker, name)
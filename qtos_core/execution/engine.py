@@ -7,18 +7,24 @@ Same flow as backtesting: strategy → advisors → risk → validators → subm
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+from collections import deque
 from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Protocol
 
+import numpy as np
+
 from qtos_core import Event, Order, Portfolio, RiskManager, Signal, Strategy
 from qtos_core.execution.broker import BrokerAdapter
 from qtos_core.execution.types import ExecutedTrade, OrderStatusKind, PortfolioState
 
 if TYPE_CHECKING:
-    pass
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +33,12 @@ logger = logging.getLogger(__name__)
 
 
 class ExecutionAdvisor(Protocol):
-    """Modify signals before risk. Same signature as backtesting Advisor."""
+    """
+    Modify signals before risk. Same signature as backtesting Advisor.
+
+    Advisors are skipped while there are no signals, unless they set an
+    `emits_signals = True` attribute (they can add signals to an empty list).
+    """
 
     def __call__(self, signals: list[Signal], event: Event, portfolio: Portfolio) -> list[Signal]:
         ...
@@ -47,7 +58,7 @@ class ExecutionObserver(Protocol):
         ...
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RejectedOrderLog:
     """One entry for a rejected or blocked order (order set when past risk; else signal)."""
 
@@ -61,8 +72,9 @@ class ExecutionEngine:
     """
     Run strategy in paper or live mode via BrokerAdapter.
     Flow: get market data → build event → strategy → advisors → risk → validators
-    → safety checks → submit_order → on fill: observers.
-    Safety: daily PnL limit, max position per trade, kill switch. Rejected orders are logged.
+    → safety checks → submit_orders (one batch per cycle) → on fill: observers.
+    Safety: daily PnL limit, max position per trade, kill switch. Rejected orders are logged
+    (most recent rejected_log_capacity entries).
     """
 
     def __init__(
@@ -77,6 +89,8 @@ class ExecutionEngine:
         daily_pnl_limit: float | None = None,
         max_position_per_trade: float | None = None,
         kill_switch: bool = False,
+        rejected_log_capacity: int = 10_000,
+        reconcile_every: int | None = None,
     ) -> None:
         self.strategy = strategy
         self.risk_manager = risk_manager
@@ -87,46 +101,68 @@ class ExecutionEngine:
         self.daily_pnl_limit = daily_pnl_limit
         self.max_position_per_trade = max_position_per_trade
         self._kill_switch = kill_switch
-        self._rejected_log: list[RejectedOrderLog] = []
+        # Compare the locally applied fills with the broker every N fills (None: never).
+        self.reconcile_every = reconcile_every
+        self._fills_since_reconcile = 0
+        # Bounded: a long-running process keeps only the most recent rejections.
+        self._rejected_log: deque[RejectedOrderLog] = deque(maxlen=rejected_log_capacity)
         self._daily_start_equity: float | None = None
+        # Event payload (symbol -> close), refilled in place each cycle and handed out
+        # through a read-only view created once.
+        self._payload_buf: dict[str, float] = {}
+        self._payload_view = MappingProxyType(self._payload_buf)
 
     def set_kill_switch(self, value: bool) -> None:
         """Emergency stop: when True, all orders are blocked."""
         self._kill_switch = value
 
     def get_rejected_log(self) -> list[RejectedOrderLog]:
-        """Return log of rejected/blocked orders for debugging and reporting."""
+        """
+        Return log of rejected/blocked orders for debugging and reporting, oldest first.
+        Only the last rejected_log_capacity entries are kept.
+        """
         return list(self._rejected_log)
 
     def _portfolio_from_state(self, state: PortfolioState) -> Portfolio:
-        """Build a Portfolio view for strategy and hooks (read-only usage)."""
+        """
+        Build a Portfolio for strategy and hooks from a broker snapshot. Positions are
+        copied explicitly: Portfolio would keep a PositionBook as is, sharing it.
+        """
         return Portfolio(cash=state.cash, positions=dict(state.positions))
 
     def _current_equity(self, state: PortfolioState, prices: dict[str, float]) -> float:
-        """Portfolio value at current prices."""
-        total = state.cash
-        for sym, qty in state.positions.items():
-            total += qty * prices.get(sym, 0.0)
-        return total
+        """Portfolio value at current prices (positions without a price count as 0)."""
+        get = prices.get
+        return state.cash + sum(qty * get(sym, 0.0) for sym, qty in state.positions.items())
 
     def _prices_from_market_data(self, symbols: list[str]) -> dict[str, float]:
         """Get latest close price per symbol from broker."""
-        df = self.broker.get_market_data(symbols)
+        return self._prices_from_frame(self.broker.get_market_data(symbols), symbols)
+
+    def _prices_from_frame(self, df: pd.DataFrame, symbols: list[str]) -> dict[str, float]:
+        """Latest close price per symbol from a get_market_data DataFrame."""
         prices: dict[str, float] = {}
         if df.empty:
             return prices
         if "symbol" in df.columns:
+            # One pass over the symbol column: later rows overwrite earlier ones, so each
+            # symbol maps to its last row.
+            last_row = dict(zip(df["symbol"].to_numpy(), range(len(df))))
+            col = "close" if "close" in df.columns else "last" if "last" in df.columns else None
+            if col is None:
+                return dict.fromkeys((s for s in symbols if s in last_row), 0.0)
+            closes = df[col].to_numpy(dtype=np.float64)
             for sym in symbols:
-                sub = df[df["symbol"] == sym]
-                if not sub.empty:
-                    row = sub.iloc[-1]
-                    prices[sym] = float(row.get("close", row.get("last", 0)))
-        else:
-            for sym in symbols:
-                if sym in df.columns:
-                    prices[sym] = float(df[sym].iloc[-1])
-                elif not df.empty:
-                    prices[sym] = float(df["close"].iloc[-1]) if "close" in df.columns else 0.0
+                i = last_row.get(sym)
+                if i is not None:
+                    price = float(closes[i])
+                    if not math.isnan(price):
+                        prices[sym] = price
+            return prices
+        last_row = df.iloc[-1]
+        close = float(last_row["close"]) if "close" in df.columns else 0.0
+        for sym in symbols:
+            prices[sym] = float(last_row[sym]) if sym in df.columns else close
         return prices
 
     def run_once(
@@ -139,10 +175,50 @@ class ExecutionEngine:
         Run one execution cycle: fetch market data, run strategy, advisors, risk, validators,
         apply safety checks, submit orders, run observers on fills.
         Call this from a scheduler or loop for paper/live; same API as backtesting step.
+
+        The event payload is a read-only symbol -> close mapping that is refilled on the
+        next cycle; strategies and hooks that keep it beyond the call should copy it
+        (dict(event.payload)).
         """
         ts = event_timestamp or datetime.now()
         state = self.broker.get_portfolio()
-        prices = self._prices_from_market_data(symbols)
+        df = self.broker.get_market_data(symbols)
+        try:
+            self._run_cycle(symbols, ts, state, df)
+        finally:
+            self.broker.prime_quotes({})  # quotes are cycle-scoped
+
+    async def run_once_async(
+        self,
+        symbols: list[str],
+        *,
+        event_timestamp: datetime | None = None,
+    ) -> None:
+        """
+        Same cycle as run_once, but fetches the portfolio and market data concurrently
+        (BrokerAdapter.aget_portfolio / aget_market_data), so the cycle waits for the
+        slower of the two calls rather than both in turn. The rest of the cycle,
+        including order submission, runs synchronously as in run_once.
+        """
+        ts = event_timestamp or datetime.now()
+        state, df = await asyncio.gather(
+            self.broker.aget_portfolio(), self.broker.aget_market_data(symbols)
+        )
+        try:
+            self._run_cycle(symbols, ts, state, df)
+        finally:
+            self.broker.prime_quotes({})
+
+    def _run_cycle(
+        self,
+        symbols: list[str],
+        ts: datetime,
+        state: PortfolioState,
+        df: pd.DataFrame,
+    ) -> None:
+        """Cycle body after the broker fetches: strategy through submission and observers."""
+        prices = self._prices_from_frame(df, symbols)
+        self.broker.prime_quotes(prices)
         portfolio = self._portfolio_from_state(state)
         equity = self._current_equity(state, prices)
 
@@ -154,49 +230,82 @@ class ExecutionEngine:
             logger.warning("Execution blocked: kill switch is on")
             return
 
-        # Build event payload (dict of symbol -> close for strategy compatibility)
-        payload = {sym: prices.get(sym, 0.0) for sym in symbols}
-        event = Event(timestamp=ts, payload=payload)
+        # Build event payload (symbol -> close for strategy compatibility), reusing the buffer
+        buf = self._payload_buf
+        buf.clear()
+        for sym in symbols:
+            buf[sym] = prices.get(sym, 0.0)
+        event = Event(timestamp=ts, payload=self._payload_view)
 
         # Strategy
         signals = self.strategy.on_event(event, portfolio)
 
-        # Advisors
+        # Advisors; on an idle cycle only those that can emit signals themselves run
         for advisor in self.advisors:
-            signals = advisor(signals, event, portfolio)
+            if signals or getattr(advisor, "emits_signals", False):
+                signals = advisor(signals, event, portfolio)
+        if not signals:
+            return
+
+        # Daily PnL limit is fixed for the cycle: when breached, block every signal up front.
+        if (
+            self.daily_pnl_limit is not None
+            and equity - self._daily_start_equity <= -self.daily_pnl_limit
+        ):
+            self._rejected_log.extend(
+                RejectedOrderLog(reason="daily_pnl_limit", timestamp=ts, signal=sig) for sig in signals
+            )
+            logger.warning("Orders blocked: daily PnL limit reached (%d signals)", len(signals))
+            return
 
-        # Risk + validators + safety → submit
+        # Risk + validators + safety → batch of orders to submit
+        max_qty = self.max_position_per_trade
+        check = self.risk_manager.check
+        validators = self.validators
+        reject = self._rejected_log.append
+        pending: list[Order] = []
         for sig in signals:
-            order = self.risk_manager.check(sig, portfolio)
+            order = check(sig, portfolio)
             if order is None:
-                self._rejected_log.append(RejectedOrderLog(reason="risk_rejected", timestamp=ts, signal=sig))
+                reject(RejectedOrderLog(reason="risk_rejected", timestamp=ts, signal=sig))
                 continue
-            for validator in self.validators:
+            for validator in validators:
                 rejected_order = order
                 order = validator(order, portfolio)
                 if order is None:
-                    self._rejected_log.append(RejectedOrderLog(reason="validator_rejected", timestamp=ts, order=rejected_order))
+                    reject(RejectedOrderLog(reason="validator_rejected", timestamp=ts, order=rejected_order))
                     break
             if order is None:
                 continue
 
+            # Re-read per order: a validator (e.g. a capital guardian) may flip the kill switch.
             if self._kill_switch:
-                self._rejected_log.append(RejectedOrderLog(reason="kill_switch", timestamp=ts, order=order))
+                reject(RejectedOrderLog(reason="kill_switch", timestamp=ts, order=order))
                 continue
-            if self.max_position_per_trade is not None and order.quantity > self.max_position_per_trade:
-                self._rejected_log.append(RejectedOrderLog(reason="max_position_per_trade", timestamp=ts, order=order))
-                logger.info("Order blocked: quantity %s > max_position_per_trade %s", order.quantity, self.max_position_per_trade)
+            if max_qty is not None and order.quantity > max_qty:
+                reject(RejectedOrderLog(reason="max_position_per_trade", timestamp=ts, order=order))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Order blocked: quantity %s > max_position_per_trade %s", order.quantity, max_qty)
                 continue
-            if self.daily_pnl_limit is not None:
-                if equity - self._daily_start_equity <= -self.daily_pnl_limit:
-                    self._rejected_log.append(RejectedOrderLog(reason="daily_pnl_limit", timestamp=ts, order=order))
-                    logger.warning("Order blocked: daily PnL limit reached")
-                    continue
+            pending.append(order)
 
-            status = self.broker.submit_order(order)
+        if not pending:
+            return
+
+        # Submit → observers on fill
+        statuses = self.broker.submit_orders(pending, now=ts)
+        observers = self.observers
+        reconcile_every = self.reconcile_every
+        # Observers see the pre-cycle state plus the fills so far, applied locally. The
+        # broker has already applied the whole batch, so it is only compared afterwards.
+        track = bool(observers or reconcile_every)
+        working = portfolio
+        n_fills = 0
+        for order, status in zip(pending, statuses):
             if status.status == OrderStatusKind.REJECTED:
-                self._rejected_log.append(RejectedOrderLog(reason=status.message or "broker_rejected", timestamp=ts, order=order))
-                logger.info("Order rejected: %s", status.message)
+                reject(RejectedOrderLog(reason=status.message or "broker_rejected", timestamp=ts, order=order))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Order rejected: %s", status.message)
                 continue
             if status.status == OrderStatusKind.FILLED and status.fill_price is not None:
                 trade = ExecutedTrade(
@@ -204,14 +313,42 @@ class ExecutionEngine:
                     side=order.side,
                     quantity=status.filled_quantity if status.filled_quantity else order.quantity,
                     price=status.fill_price,
-                    timestamp=status.timestamp or ts,
+                    timestamp=status.timestamp_dt or ts,
                     order_id=status.order_id,
                 )
-                # Refresh portfolio view for observers
-                state_after = self.broker.get_portfolio()
-                portfolio_after = self._portfolio_from_state(state_after)
-                for obs in self.observers:
-                    obs(trade, portfolio_after)
+                if not track:
+                    continue
+                n_fills += 1
+                # A fresh positions map per fill: Portfolio keeps a PositionBook as is, and
+                # earlier snapshots (and the strategy's portfolio) must not change.
+                working = Portfolio(cash=working.cash, positions=dict(working.positions))
+                signed_qty = trade.quantity * trade.side
+                working.cash -= signed_qty * trade.price
+                working.update_position(trade.symbol, signed_qty)
+                for obs in observers:
+                    obs(trade, working)
+
+        if reconcile_every and n_fills:
+            self._fills_since_reconcile += n_fills
+            if self._fills_since_reconcile >= reconcile_every:
+                self._fills_since_reconcile = 0
+                self._reconcile(working)
+
+    def _reconcile(self, expected: Portfolio) -> None:
+        """Log any drift between the locally applied fills and the broker's portfolio."""
+        state = self.broker.get_portfolio()
+        drift = {
+            sym: state.positions.get(sym, 0.0) - expected.position(sym)
+            for sym in {*state.positions, *expected.positions}
+        }
+        drift = {sym: d for sym, d in drift.items() if not math.isclose(d, 0.0, abs_tol=1e-9)}
+        cash_drift = state.cash - expected.cash
+        if drift or not math.isclose(cash_drift, 0.0, abs_tol=1e-6):
+            logger.warning(
+                "Portfolio drift at reconcile: cash %+.6f, positions %s (broker - local)",
+                cash_drift,
+                drift,
+            )
 
     def reset_daily_pnl_baseline(self) -> None:
         """Reset daily start equity to current equity (e.g. at start of day)."""
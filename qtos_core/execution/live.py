@@ -12,7 +12,11 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import uuid
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Callable
 
@@ -30,10 +34,8 @@ logger = logging.getLogger(__name__)
 LIVE_TRADING_ENV = "QTOS_LIVE_TRADING_ENABLED"
 
 
-def _resolve_symbol(internal: str, symbol_map: dict[str, str] | None) -> str:
-    """Map internal symbol to broker symbol. Identity if no map or not present."""
-    if symbol_map and internal in symbol_map:
-        return symbol_map[internal]
+def _same_symbol(internal: str, default: str | None = None) -> str:
+    """Symbol resolver used when there is no symbol_map: broker symbol == internal symbol."""
     return internal
 
 
@@ -46,6 +48,9 @@ class LiveBrokerAdapter(BrokerAdapter):
       orders are rejected.
 
     Symbol mapping: internal symbol → broker symbol via symbol_map (e.g. "SPY" → "SPY" or "BTC" → "BTCUSD").
+
+    max_concurrency: how many orders submit_orders may have in flight at once (default 1,
+    sequential). Broker calls are blocking I/O, so threads overlap their round-trips.
     """
 
     def __init__(
@@ -58,17 +63,30 @@ class LiveBrokerAdapter(BrokerAdapter):
         *,
         initial_cash: float = 0.0,
         market_data_source: Callable[[list[str]], pd.DataFrame] | None = None,
+        max_concurrency: int = 1,
     ) -> None:
         self._api_key = api_key
         self._api_secret = api_secret
         self._sandbox = sandbox
         self._base_url = base_url
         self._symbol_map = symbol_map or {}
+        # Internal -> broker symbol, called as self._resolve(symbol, symbol).
+        self._resolve: Callable[[str, str], str] = (
+            self._symbol_map.get if self._symbol_map else _same_symbol
+        )
         self._market_data_source = market_data_source
         self._session_authenticated = False
         # Sandbox-only: simulated cash/positions when no real broker state (e.g. placeholder API).
         self._sandbox_cash = initial_cash
-        self._sandbox_positions: dict[str, float] = {}
+        self._sandbox_positions: defaultdict[str, float] = defaultdict(float)
+        # Concurrent submit_orders fills: one lock per symbol's position, one for cash.
+        self._position_locks: dict[str, threading.Lock] = {}
+        self._cash_lock = threading.Lock()
+        # Latest prices handed in by the engine for the current cycle (see prime_quotes).
+        self._quote_cache: dict[str, float] = {}
+        # submit_orders keeps up to max_concurrency requests in flight (pool created on first use).
+        self._max_concurrency = max(1, max_concurrency)
+        self._pool: ThreadPoolExecutor | None = None
 
         # TODO: Replace with real broker SDK authentication when integrating a specific broker.
         # Example: self._client = alpaca_trade_api.REST(api_key, api_secret, base_url=paper_url)
@@ -95,7 +113,7 @@ class LiveBrokerAdapter(BrokerAdapter):
         self._session_authenticated = True
         logger.debug("LiveBrokerAdapter: authentication placeholder completed.")
 
-    def submit_order(self, order: Order) -> OrderStatus:
+    def submit_order(self, order: Order, *, now: datetime | None = None) -> OrderStatus:
         """
         Submit an order to the broker. Market orders only in this implementation.
 
@@ -104,47 +122,115 @@ class LiveBrokerAdapter(BrokerAdapter):
         - Translates internal Order to broker format, submits, maps response to OrderStatus.
         - Handles: accepted (PENDING), rejected, partially filled, filled.
         - On API errors: returns REJECTED OrderStatus with reason; no silent failures.
+        - Status timestamps are `now` (datetime.now() if not given).
         """
+        if now is None:
+            now = datetime.now()
         mode = "sandbox" if self._sandbox else "live"
-        broker_symbol = _resolve_symbol(order.symbol, self._symbol_map)
-        logger.info(
-            "Submitting order: symbol=%s (broker=%s), side=%s, qty=%s, mode=%s",
-            order.symbol,
-            broker_symbol,
-            order.side.value,
-            order.quantity,
-            mode,
-        )
+        broker_symbol = self._log_submission(order, mode)
+        if self._live_disabled():
+            return self._live_disabled_status(now)
+        return self._submit_guarded(order, broker_symbol, mode, now)
+
+    def submit_orders(
+        self, orders: Sequence[Order], *, now: datetime | None = None
+    ) -> list[OrderStatus]:
+        """
+        Submit a batch of orders; one status per order, in order.
+
+        The live-trading gate is checked once for the whole batch. Each order is
+        still mapped and guarded individually, so one API error rejects only that order.
+        With max_concurrency > 1, up to that many orders are in flight at once on a
+        thread pool owned by the adapter (see close()); statuses keep the input order.
+        Every status is stamped with one `now`, taken once per batch if not given.
 
-        if not self._sandbox and os.environ.get(LIVE_TRADING_ENV, "").lower() != "true":
-            reason = (
-                f"Live trading disabled. Set {LIVE_TRADING_ENV}=true to allow real orders."
+        TODO: Use the broker's bulk endpoint where one exists so a batch costs one round-trip.
+        """
+        if not orders:
+            return []
+        if now is None:
+            now = datetime.now()
+        mode = "sandbox" if self._sandbox else "live"
+        if self._live_disabled():
+            for order in orders:
+                self._log_submission(order, mode)
+            return [self._live_disabled_status(now)] * len(orders)
+        symbols = [self._log_submission(order, mode) for order in orders]
+        if self._max_concurrency == 1 or len(orders) == 1:
+            return [self._submit_guarded(o, sym, mode, now) for o, sym in zip(orders, symbols)]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_concurrency, thread_name_prefix="qtos-live-submit"
             )
-            logger.warning("Order rejected: %s", reason)
-            return OrderStatus(
-                status=OrderStatusKind.REJECTED,
-                message=reason,
-                timestamp=datetime.now(),
+        n = len(orders)
+        return list(self._pool.map(self._submit_guarded, orders, symbols, [mode] * n, [now] * n))
+
+    def close(self) -> None:
+        """Release the submit thread pool, if one was started. The adapter stays usable."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def prime_quotes(self, prices: Mapping[str, float]) -> None:
+        """
+        Replace the quote cache with this cycle's prices ({} clears it, as the engine does
+        at the end of each cycle). Sandbox fills use a cached price when present and only
+        fetch market data for symbols not in the cache.
+        """
+        self._quote_cache = dict(prices)
+
+    def _log_submission(self, order: Order, mode: str) -> str:
+        """Log an outgoing order; return its broker symbol."""
+        broker_symbol = self._resolve(order.symbol, order.symbol)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Submitting order: symbol=%s (broker=%s), side=%s, qty=%s, mode=%s",
+                order.symbol,
+                broker_symbol,
+                order.side,
+                order.quantity,
+                mode,
             )
+        return broker_symbol
+
+    def _live_disabled(self) -> bool:
+        """True when not in sandbox and live trading is not enabled via the environment."""
+        return not self._sandbox and os.environ.get(LIVE_TRADING_ENV, "").lower() != "true"
+
+    def _live_disabled_status(self, now: datetime) -> OrderStatus:
+        """REJECTED status for orders blocked by the live-trading gate."""
+        reason = (
+            f"Live trading disabled. Set {LIVE_TRADING_ENV}=true to allow real orders."
+        )
+        logger.warning("Order rejected: %s", reason)
+        return OrderStatus(
+            status=OrderStatusKind.REJECTED,
+            message=reason,
+            timestamp=now,
+        )
 
+    def _submit_guarded(
+        self, order: Order, broker_symbol: str, mode: str, now: datetime
+    ) -> OrderStatus:
+        """Submit one order; API errors become a REJECTED status instead of raising."""
         try:
             # TODO: Replace with real broker order submission.
             # 1. Build broker-specific order payload (e.g. symbol=broker_symbol, qty, side, type=market).
             # 2. POST to sandbox or live endpoint based on self._sandbox.
             # 3. Map broker response to OrderStatus (accepted -> PENDING, filled -> FILLED, etc.).
             # For now we simulate an immediate fill in sandbox to satisfy the interface.
-            return self._submit_order_impl(order, broker_symbol, mode)
+            return self._submit_order_impl(order, broker_symbol, mode, now)
         except Exception as e:  # noqa: BLE001
             reason = f"Broker API error: {e!s}"
             logger.exception("Order submission failed: %s", reason)
             return OrderStatus(
                 status=OrderStatusKind.REJECTED,
                 message=reason,
-                timestamp=datetime.now(),
+                timestamp=now,
             )
 
     def _submit_order_impl(
-        self, order: Order, broker_symbol: str, mode: str
+        self, order: Order, broker_symbol: str, mode: str, now: datetime
     ) -> OrderStatus:
         """
         Placeholder implementation: in sandbox, simulate immediate fill; otherwise reject.
@@ -155,63 +241,89 @@ class LiveBrokerAdapter(BrokerAdapter):
             # Sandbox: simulate immediate fill. In real integration, call broker paper API
             # and map their response (e.g. order_id, filled_qty, filled_price) to OrderStatus.
             order_id = f"live-sandbox-{uuid.uuid4().hex[:12]}"
-            fill_price = 0.0
-            df = self.get_market_data([order.symbol])
-            if not df.empty and "close" in df.columns:
-                if "symbol" in df.columns:
-                    sub = df[df["symbol"] == order.symbol]
-                    row = sub.iloc[-1] if len(sub) > 0 else df.iloc[-1]
-                else:
-                    row = df.iloc[-1]
-                fill_price = float(row.get("close", 0.0))
+            fill_price = self._quote_cache.get(order.symbol)
+            if fill_price is None:
+                fill_price = 0.0
+                df = self.get_market_data([order.symbol])
+                if not df.empty and "close" in df.columns:
+                    if "symbol" in df.columns:
+                        sub = df[df["symbol"] == order.symbol]
+                        row = sub.iloc[-1] if len(sub) > 0 else df.iloc[-1]
+                    else:
+                        row = df.iloc[-1]
+                    fill_price = float(row.get("close", 0.0))
+            return self._apply_sandbox_fill(order, order_id, fill_price, now)
+        # Live: TODO call real broker API and map response.
+        return OrderStatus(
+            status=OrderStatusKind.REJECTED,
+            message="Live broker API not implemented; use sandbox=True or add SDK integration.",
+            timestamp=now,
+        )
+
+    def _position_lock(self, symbol: str) -> threading.Lock:
+        """Lock guarding one symbol's sandbox position (created on first use)."""
+        lock = self._position_locks.get(symbol)
+        if lock is None:
+            lock = self._position_locks.setdefault(symbol, threading.Lock())
+        return lock
+
+    def _apply_sandbox_fill(
+        self, order: Order, order_id: str, fill_price: float, now: datetime
+    ) -> OrderStatus:
+        """
+        Check and apply a simulated fill to sandbox cash/positions.
+
+        The symbol's lock is held for the whole check-and-update and the cash lock only
+        around the cash check/update, so concurrent fills in different symbols serialize
+        on cash alone. Locks are always taken symbol first, then cash.
+        """
+        symbol = order.symbol
+        notional = order.quantity * fill_price if fill_price > 0 else 0.0
+        positions = self._sandbox_positions
+        with self._position_lock(symbol):
             if order.side == Side.SELL:
-                pos = self._sandbox_positions.get(order.symbol, 0)
+                pos = positions.get(symbol, 0)  # .get: a rejected sell must not insert a key
                 if pos < order.quantity:
-                    logger.warning("Order rejected (sandbox): insufficient position %s for %s", pos, order.symbol)
+                    logger.warning("Order rejected (sandbox): insufficient position %s for %s", pos, symbol)
                     return OrderStatus(
                         status=OrderStatusKind.REJECTED,
                         message="Insufficient position (sandbox)",
-                        timestamp=datetime.now(),
+                        timestamp=now,
                     )
+                remaining = pos - order.quantity
+                if remaining <= 0:
+                    positions.pop(symbol, None)
+                else:
+                    positions[symbol] = remaining
+                with self._cash_lock:
+                    self._sandbox_cash += notional
             else:
-                cost = order.quantity * (fill_price if fill_price > 0 else 0)
-                if cost > 0 and self._sandbox_cash < cost:
-                    logger.warning("Order rejected (sandbox): insufficient cash %.2f for cost %.2f", self._sandbox_cash, cost)
-                    return OrderStatus(
-                        status=OrderStatusKind.REJECTED,
-                        message="Insufficient cash (sandbox)",
-                        timestamp=datetime.now(),
-                    )
+                with self._cash_lock:
+                    if notional > 0 and self._sandbox_cash < notional:
+                        logger.warning(
+                            "Order rejected (sandbox): insufficient cash %.2f for cost %.2f",
+                            self._sandbox_cash,
+                            notional,
+                        )
+                        return OrderStatus(
+                            status=OrderStatusKind.REJECTED,
+                            message="Insufficient cash (sandbox)",
+                            timestamp=now,
+                        )
+                    self._sandbox_cash -= notional
+                positions[symbol] += order.quantity
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 "Broker response (sandbox simulated): order_id=%s, status=filled, fill_price=%s",
                 order_id,
                 fill_price,
             )
-            # Update sandbox portfolio state so get_portfolio() reflects the fill.
-            if order.side == Side.BUY:
-                self._sandbox_cash -= order.quantity * fill_price if fill_price > 0 else 0.0
-                self._sandbox_positions[order.symbol] = (
-                    self._sandbox_positions.get(order.symbol, 0) + order.quantity
-                )
-            else:
-                self._sandbox_positions[order.symbol] = (
-                    self._sandbox_positions.get(order.symbol, 0) - order.quantity
-                )
-                self._sandbox_cash += order.quantity * fill_price if fill_price > 0 else 0.0
-                if self._sandbox_positions[order.symbol] <= 0:
-                    self._sandbox_positions.pop(order.symbol, None)
-            return OrderStatus(
-                status=OrderStatusKind.FILLED,
-                order_id=order_id,
-                fill_price=fill_price,
-                filled_quantity=order.quantity,
-                timestamp=datetime.now(),
-            )
-        # Live: TODO call real broker API and map response.
         return OrderStatus(
-            status=OrderStatusKind.REJECTED,
-            message="Live broker API not implemented; use sandbox=True or add SDK integration.",
-            timestamp=datetime.now(),
+            status=OrderStatusKind.FILLED,
+            order_id=order_id,
+            fill_price=fill_price,
+            filled_quantity=order.quantity,
+            timestamp=now,
         )
 
     def get_portfolio(self) -> PortfolioState:
@@ -227,7 +339,11 @@ class LiveBrokerAdapter(BrokerAdapter):
             # Example: account = self._client.get_account(); positions = self._client.list_positions()
             if self._sandbox:
                 # Use simulated state when no real broker API; real sandbox would query broker paper API.
-                return PortfolioState(cash=self._sandbox_cash, positions=dict(self._sandbox_positions))
+                # Copy first (atomic), then drop any zero entries left by the defaultdict.
+                positions = dict(self._sandbox_positions)
+                return PortfolioState(
+                    cash=self._sandbox_cash, positions={s: q for s, q in positions.items() if q}
+                )
             return PortfolioState(cash=0.0, positions={})
         except Exception as e:  # noqa: BLE001
             logger.exception("get_portfolio failed: %s", e)
@@ -252,8 +368,10 @@ class LiveBrokerAdapter(BrokerAdapter):
         try:
             # TODO: Call broker API for latest bars/quotes per symbol. Map to DataFrame.
             # Limitation: some brokers only support single-symbol or limited bulk; loop if needed.
-            broker_symbols = [_resolve_symbol(s, self._symbol_map) for s in symbols]
-            logger.debug("get_market_data requested: %s (broker: %s)", symbols, broker_symbols)
+            if logger.isEnabledFor(logging.DEBUG):
+                resolve = self._resolve
+                broker_symbols = [resolve(s, s) for s in symbols]
+                logger.debug("get_market_data requested: %s (broker: %s)", symbols, broker_symbols)
             # Placeholder: empty DataFrame. Real implementation would fill rows indexed by timestamp.
             return pd.DataFrame(columns=["symbol", "open", "high", "low", "close", "volume"])
         except Exception as e:  # noqa: BLE001
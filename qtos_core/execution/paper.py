@@ -7,35 +7,221 @@ data from a provided source (e.g. dict of symbol -> price, or DataFrame provider
 
 from __future__ import annotations
 
+from array import array
+from collections.abc import Sequence
 from datetime import datetime
+from importlib.util import find_spec
+from types import MappingProxyType
 from typing import Callable
+import itertools
+import math
+import time
 import uuid
 
+import numpy as np
 import pandas as pd
 
 from qtos_core.order import Order
-from qtos_core.signal import Side
 
 from qtos_core.execution.broker import BrokerAdapter
+from qtos_core.execution.snapshot import DictSnapshot, MarketSnapshot
 from qtos_core.execution.types import OrderStatus, OrderStatusKind, PortfolioState
 
 
+_REJECTED = OrderStatusKind.REJECTED
+_FILLED = OrderStatusKind.FILLED
+
+# Rejection statuses differ only by timestamp; submit_order stamps a copy of one of these
+# (via _finish).
+_REJECT_NO_DATA = OrderStatus(status=_REJECTED, message="No market data for symbol")
+_REJECT_INVALID_PRICE = OrderStatus(status=_REJECTED, message="Invalid price")
+_REJECT_NO_CASH = OrderStatus(status=_REJECTED, message="Insufficient cash")
+_REJECT_NO_POSITION = OrderStatus(status=_REJECTED, message="Insufficient position")
+# Indexed by the fill kernel's result codes (see _paper_kernel).
+_KERNEL_REJECTS = (
+    None, _REJECT_NO_DATA, _REJECT_INVALID_PRICE, _REJECT_NO_CASH, _REJECT_NO_POSITION
+)
+
+# Batches at least this long go through the compiled fill kernel, when numba is installed;
+# below that, marshalling to arrays costs more than the plain loop.
+_NUMBA = find_spec("numba") is not None
+_KERNEL_MIN_BATCH = 256
+
+# df.attrs flag set by backtesting.data_loader.load_dataframe (SCHEMA_CANONICAL): columns
+# are already lowercase float64 OHLC(V), so "close" is read without alias fallbacks.
+# pandas carries attrs through concat, filtering and column assignment, so the flag is
+# only trusted for frames that still have no symbol column.
+_SCHEMA_CANONICAL = "schema_canonical"
+
+_NO_TS = np.iinfo(np.int64).min  # NaT in pandas
+
+
+class _OrderLog:
+    """
+    Submitted orders and their statuses, stored column-wise.
+
+    Numeric fields go into typed arrays (side as +1/-1, quantities, prices, status code,
+    epoch-ns timestamp), so the log costs a few dozen bytes per entry and converts to a
+    DataFrame without touching Python objects row by row. The Order objects (which
+    already exist) are kept by reference; OrderStatus objects are rebuilt on request.
+    """
+
+    __slots__ = (
+        "fill_price", "filled_quantity", "messages", "order_ids", "orders", "quantity",
+        "side", "status", "ts_dt", "ts_ns",
+    )
+
+    def __init__(self) -> None:
+        self.orders: list[Order] = []
+        self.side = array("b")
+        self.quantity = array("d")
+        self.fill_price = array("d")  # NaN when the status has no fill price
+        self.filled_quantity = array("d")
+        self.status = array("b")  # OrderStatusKind value
+        self.ts_ns = array("q")  # nanoseconds since the epoch (UTC); _NO_TS if unstamped
+        self.ts_dt: list[datetime | None] = []  # the datetime given, if not stamped in ns
+        self.order_ids: list[str | None] = []
+        self.messages: list[str | None] = []
+
+    def append(self, order: Order, status: OrderStatus) -> None:
+        self.orders.append(order)
+        self.side.append(order.side)
+        self.quantity.append(order.quantity)
+        self.fill_price.append(math.nan if status.fill_price is None else status.fill_price)
+        self.filled_quantity.append(status.filled_quantity)
+        self.status.append(status.status)
+        ts = status.timestamp
+        if isinstance(ts, int):
+            self.ts_ns.append(ts)
+            self.ts_dt.append(None)
+        elif ts is None:
+            self.ts_ns.append(_NO_TS)
+            self.ts_dt.append(None)
+        else:
+            self.ts_ns.append(round(ts.timestamp() * 1e6) * 1_000)
+            self.ts_dt.append(ts)
+        self.order_ids.append(status.order_id)
+        self.messages.append(status.message)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def entries(self) -> list[tuple[Order, OrderStatus]]:
+        """(Order, OrderStatus) pairs, rebuilding each status from the columns."""
+        return [
+            (
+                order,
+                OrderStatus(
+                    status=OrderStatusKind(code),
+                    order_id=order_id,
+                    fill_price=None if math.isnan(price) else price,
+                    filled_quantity=filled,
+                    message=message,
+                    timestamp=dt if dt is not None else (None if ns == _NO_TS else ns),
+                ),
+            )
+            for order, code, order_id, price, filled, message, dt, ns in zip(
+                self.orders, self.status, self.order_ids, self.fill_price,
+                self.filled_quantity, self.messages, self.ts_dt, self.ts_ns,
+            )
+        ]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """One row per entry; built from the typed arrays without per-row objects."""
+        # np.array copies each typed array through the buffer protocol in one step.
+        return pd.DataFrame(
+            {
+                "symbol": pd.Categorical([o.symbol for o in self.orders]),
+                "side": np.array(self.side, dtype=np.int8),
+                "quantity": np.array(self.quantity, dtype=np.float64),
+                "status": pd.Categorical.from_codes(
+                    np.array(self.status, dtype=np.int8),
+                    categories=[str(kind) for kind in OrderStatusKind],
+                ),
+                "fill_price": np.array(self.fill_price, dtype=np.float64),
+                "filled_quantity": np.array(self.filled_quantity, dtype=np.float64),
+                "timestamp": pd.to_datetime(
+                    np.array(self.ts_ns, dtype=np.int64), unit="ns", utc=True
+                ),
+                "order_id": list(self.order_ids),
+            },
+            copy=False,
+        )
+
+
 def _default_market_data(symbols: list[str]) -> pd.DataFrame:
     """Default: no data. Override via constructor for paper simulation."""
     return pd.DataFrame(columns=["symbol", "open", "high", "low", "close", "volume"])
 
 
+_NO_PRICES = pd.DataFrame(columns=["symbol", "close"])
+
+
 def _prices_to_dataframe(symbols: list[str], prices: dict[str, float]) -> pd.DataFrame:
-    """Build a one-row-per-symbol DataFrame with close from prices dict."""
-    rows = [{"symbol": s, "open": p, "high": p, "low": p, "close": p, "volume": 0} for s, p in prices.items() if s in symbols]
-    return pd.DataFrame(rows) if rows else pd.DataFrame(columns=["symbol", "close"])
+    """
+    Build a one-row-per-symbol DataFrame with close from prices dict, in the order
+    symbols were requested (symbols without a price are left out).
+
+    Built column-wise from one price array; open/high/low/close each get their own copy,
+    so the columns stay independent and writable.
+    """
+    # Requested order, duplicates dropped; O(len(symbols)) dict lookups however large prices is.
+    syms = [s for s in dict.fromkeys(symbols) if s in prices]
+    if not syms:
+        return _NO_PRICES.copy(deep=False)
+    arr = np.fromiter((prices[s] for s in syms), dtype=np.float64, count=len(syms))
+    return pd.DataFrame(
+        {
+            "symbol": syms,
+            "open": arr.copy(),
+            "high": arr.copy(),
+            "low": arr.copy(),
+            "close": arr,
+            "volume": np.zeros(len(syms), dtype=np.int64),
+        },
+        copy=False,
+    )
+
+
+def _snapshot_to_dataframe(symbols: list[str], snapshot: MarketSnapshot) -> pd.DataFrame:
+    """get_market_data for a MarketSnapshot: quoted symbols only, in request order."""
+    close = snapshot.close
+    prices = {s: p for s in dict.fromkeys(symbols) if (p := close(s)) is not None}
+    return _prices_to_dataframe(symbols, prices)
+
+
+def _index_closes(df: pd.DataFrame, has_symbol: bool) -> tuple[dict[str, float], float]:
+    """
+    Closes of a non-empty market-data frame as (symbol -> close, fallback), matching
+    _price_from_market_data (close, else last): the first row per symbol wins, and symbols without a row
+    (or frames without a symbol column) get the first row's close.
+    """
+    columns = df.columns
+    col = "close" if "close" in columns else "last" if "last" in columns else None
+    if col is None:  # schema changed under strict=False; price as 0, like row.get(..., 0)
+        return {}, 0.0
+    close = df[col].astype(float).tolist()
+    if not has_symbol:
+        return {}, close[0]
+    symbols = df["symbol"].tolist()
+    # Reversed, so earlier rows overwrite later ones and each symbol keeps its first row.
+    return dict(zip(reversed(symbols), reversed(close))), close[0]
 
 
 class PaperBrokerAdapter(BrokerAdapter):
     """
     Paper trading adapter. Simulates fills at latest price from get_market_data.
     Maintains internal cash and positions; get_portfolio returns that state.
-    Market data: pass market_data_source(symbols -> DataFrame), or latest_prices (dict symbol -> price).
+    Market data: pass market_data_source(symbols -> DataFrame), latest_prices (dict symbol
+    -> price) or market_snapshot (a MarketSnapshot). With latest_prices or market_snapshot,
+    fills look prices up in the snapshot; get_market_data builds a DataFrame from it only
+    when asked.
+
+    strict: when fills price from get_market_data DataFrames, check their columns on every
+    call (default). With strict=False the first non-empty frame's columns are inspected
+    once and trusted afterwards, and a frame the source returns again (the same object)
+    is indexed once instead of filtered per order; use it when the source always returns
+    the same schema and does not modify frames in place.
     """
 
     def __init__(
@@ -44,85 +230,279 @@ class PaperBrokerAdapter(BrokerAdapter):
         *,
         market_data_source: Callable[[list[str]], pd.DataFrame] | None = None,
         latest_prices: dict[str, float] | None = None,
+        market_snapshot: MarketSnapshot | None = None,
+        strict: bool = True,
     ) -> None:
         self._cash = initial_cash
         self._positions: dict[str, float] = {}
-        self._order_log: list[tuple[Order, OrderStatus]] = []
+        # Copy-on-write positions snapshot for get_portfolio: a read-only copy rebuilt only
+        # after a fill (_version is bumped on every fill), so reads neither copy per call
+        # nor see later fills.
+        self._version = 0
+        self._positions_view = MappingProxyType({})
+        self._view_version = 0
+        # Returned by get_portfolio(reuse=True) while _scratch_version == _version.
+        self._portfolio_scratch = PortfolioState(cash=initial_cash, positions=self._positions_view)
+        self._scratch_version = 0
+        self._order_log = _OrderLog()
+        self._strict = strict
+        # (has "close", has "symbol") of the market-data frames; cached only if not strict.
+        self._schema: tuple[bool, bool] | None = None
+        # Last market-data frame and its (symbol -> close, fallback close); only if not strict.
+        self._frame: pd.DataFrame | None = None
+        self._frame_closes: tuple[dict[str, float], float] = ({}, 0.0)
+        # Order ids: a random per-adapter prefix (so adapters never collide) plus a counter.
+        self._id_prefix = f"paper-{uuid.uuid4().hex[:6]}-"
+        self._id_counter = itertools.count(1)
+        # Fills price through the snapshot when there is one, instead of building and
+        # filtering a DataFrame per order. latest_prices only becomes the snapshot if
+        # get_market_data is not overridden, so such subclasses keep pricing through it.
+        self._snapshot: MarketSnapshot | None = None
         if market_data_source is not None:
             self._market_data_source = market_data_source
+        elif market_snapshot is not None:
+            self._snapshot = market_snapshot
+            self._market_data_source = lambda syms: _snapshot_to_dataframe(syms, market_snapshot)
         elif latest_prices is not None:
             self._market_data_source = lambda syms: _prices_to_dataframe(syms, latest_prices)
+            if type(self).get_market_data is PaperBrokerAdapter.get_market_data:
+                self._snapshot = DictSnapshot(latest_prices)
         else:
             self._market_data_source = _default_market_data
+        # The price source is fixed from here on, so pick the lookup once instead of
+        # re-deciding it per order.
+        self._get_close: Callable[[str], float | None] = (
+            self._snapshot.close if self._snapshot is not None else self._price_from_market_data
+        )
 
-    def submit_order(self, order: Order) -> OrderStatus:
-        """Simulate fill at latest close price for order.symbol."""
-        df = self.get_market_data([order.symbol])
-        if df.empty or "close" not in df.columns:
-            status = OrderStatus(
-                status=OrderStatusKind.REJECTED,
-                message="No market data for symbol",
-                timestamp=datetime.now(),
-            )
-            self._order_log.append((order, status))
-            return status
-
-        if "symbol" in df.columns:
-            sub = df[df["symbol"] == order.symbol]
-            row = sub.iloc[0] if len(sub) > 0 else df.iloc[0]
-        else:
-            row = df.iloc[0]
-        price = float(row.get("close", row.get("last", 0)))
+    def submit_order(self, order: Order, *, now: datetime | None = None) -> OrderStatus:
+        """
+        Simulate fill at latest close price for order.symbol. The status is stamped with
+        now, or with time.time_ns() if not given (see OrderStatus.timestamp_dt).
+        """
+        stamp = time.time_ns() if now is None else now
+        price = self._get_close(order.symbol)
+        if price is None:
+            return self._finish(order, _REJECTED, stamp, message=_REJECT_NO_DATA.message)
+        price = float(price)
         if price <= 0:
-            status = OrderStatus(
-                status=OrderStatusKind.REJECTED,
-                message="Invalid price",
-                timestamp=datetime.now(),
-            )
-            self._order_log.append((order, status))
-            return status
-
-        cost = order.quantity * price
-        if order.side == Side.BUY:
-            if self._cash < cost:
-                status = OrderStatus(
-                    status=OrderStatusKind.REJECTED,
-                    message="Insufficient cash",
-                    timestamp=datetime.now(),
-                )
-                self._order_log.append((order, status))
-                return status
-            self._cash -= cost
-            self._positions[order.symbol] = self._positions.get(order.symbol, 0) + order.quantity
+            return self._finish(order, _REJECTED, stamp, message=_REJECT_INVALID_PRICE.message)
+
+        symbol = order.symbol
+        positions = self._positions
+        pos = positions.get(symbol, 0)
+        qty = order.quantity
+        side = order.side  # IntEnum: +1 buy, -1 sell
+        if side > 0:
+            if self._cash < qty * price:
+                return self._finish(order, _REJECTED, stamp, message=_REJECT_NO_CASH.message)
+        elif pos < qty:
+            return self._finish(order, _REJECTED, stamp, message=_REJECT_NO_POSITION.message)
+        # Validated; buys and sells now differ only by the sign of the quantity.
+        signed_qty = qty * side
+        self._cash -= signed_qty * price
+        pos += signed_qty
+        # One read above, one write here: a flat position is removed rather than stored.
+        if pos == 0:
+            positions.pop(symbol, None)
         else:
-            pos = self._positions.get(order.symbol, 0)
-            if pos < order.quantity:
-                status = OrderStatus(
-                    status=OrderStatusKind.REJECTED,
-                    message="Insufficient position",
-                    timestamp=datetime.now(),
-                )
-                self._order_log.append((order, status))
-                return status
-            self._cash += order.quantity * price
-            self._positions[order.symbol] = pos - order.quantity
-            if self._positions[order.symbol] == 0:
-                del self._positions[order.symbol]
-
-        order_id = f"paper-{uuid.uuid4().hex[:12]}"
-        status = OrderStatus(
-            status=OrderStatusKind.FILLED,
-            order_id=order_id,
-            fill_price=price,
-            filled_quantity=order.quantity,
-            timestamp=datetime.now(),
+            positions[symbol] = pos
+        self._version += 1
+
+        order_id = f"{self._id_prefix}{next(self._id_counter)}"
+        return self._finish(order, _FILLED, stamp, price=price, qty=qty, order_id=order_id)
+
+    def submit_orders(
+        self, orders: Sequence[Order], *, now: datetime | None = None
+    ) -> list[OrderStatus]:
+        """
+        Submit a batch with the same per-order rules and results as submit_order, in order.
+
+        With a snapshot the batch is priced and checked in one pass over local running
+        cash/positions, with one timestamp, and adapter state is written back once at the
+        end. Otherwise this falls back to submit_order per order.
+        """
+        if self._snapshot is None:
+            return super().submit_orders(orders, now=now)
+        stamp = time.time_ns() if now is None else now
+        if _NUMBA and len(orders) >= _KERNEL_MIN_BATCH:
+            return self._submit_orders_kernel(orders, stamp)
+        lookup = self._snapshot.close
+        positions = self._positions
+        finish = self._finish
+        id_prefix = self._id_prefix
+        next_id = self._id_counter.__next__
+        cash = self._cash
+        touched: dict[str, float] = {}  # running position of each symbol this batch fills
+        statuses: list[OrderStatus] = []
+        for order in orders:
+            symbol = order.symbol
+            qty = order.quantity
+            price = lookup(symbol)
+            if price is None:
+                template = _REJECT_NO_DATA
+            elif price <= 0:
+                template = _REJECT_INVALID_PRICE
+            else:
+                price = float(price)
+                pos = touched.get(symbol)
+                if pos is None:
+                    pos = positions.get(symbol, 0)
+                side = order.side
+                if side > 0:
+                    template = _REJECT_NO_CASH if cash < qty * price else None
+                else:
+                    template = _REJECT_NO_POSITION if pos < qty else None
+                if template is None:
+                    signed_qty = qty * side
+                    cash -= signed_qty * price
+                    touched[symbol] = pos + signed_qty
+            if template is None:
+                order_id = f"{id_prefix}{next_id()}"
+                status = finish(order, _FILLED, stamp, price=price, qty=qty, order_id=order_id)
+            else:
+                status = finish(order, _REJECTED, stamp, message=template.message)
+            statuses.append(status)
+        self._cash = cash
+        for symbol, pos in touched.items():
+            if pos == 0:
+                positions.pop(symbol, None)
+            else:
+                positions[symbol] = pos
+        if touched:
+            self._version += 1
+        return statuses
+
+    def _submit_orders_kernel(
+        self, orders: Sequence[Order], stamp: datetime | int
+    ) -> list[OrderStatus]:
+        """submit_orders for large batches: marshal to arrays and run the compiled kernel."""
+        from qtos_core.execution import _paper_kernel as kernel
+
+        n = len(orders)
+        ids: dict[str, int] = {}
+        sym_id = np.fromiter(
+            (ids.setdefault(o.symbol, len(ids)) for o in orders), dtype=np.intp, count=n
         )
-        self._order_log.append((order, status))
+        close = self._snapshot.close
+        quotes = [close(s) for s in ids]
+        priced = np.array([p is not None for p in quotes], dtype=np.bool_)
+        price = np.array([0.0 if p is None else p for p in quotes], dtype=np.float64)
+        positions = self._positions
+        pos = np.array([positions.get(s, 0) for s in ids], dtype=np.float64)
+        qty = np.fromiter((o.quantity for o in orders), dtype=np.float64, count=n)
+        side = np.fromiter((o.side for o in orders), dtype=np.int8, count=n)
+        codes, cash = kernel.simulate_fills(price, priced, qty, side, sym_id, self._cash, pos)
+
+        self._cash = float(cash)
+        filled = codes == kernel.FILLED
+        symbols = list(ids)
+        for j in np.unique(sym_id[filled]).tolist():
+            q = float(pos[j])
+            if q == 0:
+                positions.pop(symbols[j], None)
+            else:
+                positions[symbols[j]] = q
+        if filled.any():
+            self._version += 1
+
+        templates = _KERNEL_REJECTS
+        price_list = price.tolist()
+        finish = self._finish
+        id_prefix = self._id_prefix
+        next_id = self._id_counter.__next__
+        statuses: list[OrderStatus] = []
+        for order, code, j in zip(orders, codes.tolist(), sym_id.tolist()):
+            if code == kernel.FILLED:
+                order_id = f"{id_prefix}{next_id()}"
+                status = finish(
+                    order, _FILLED, stamp,
+                    price=price_list[j], qty=order.quantity, order_id=order_id,
+                )
+            else:
+                status = finish(order, _REJECTED, stamp, message=templates[code].message)
+            statuses.append(status)
+        return statuses
+
+    def _finish(
+        self,
+        order: Order,
+        kind: OrderStatusKind,
+        stamp: datetime | int,
+        *,
+        message: str | None = None,
+        price: float | None = None,
+        qty: float = 0.0,
+        order_id: str | None = None,
+    ) -> OrderStatus:
+        """Build the status for order, record it in the order log and return it."""
+        # Positional construction: cheaper than keywords or dataclasses.replace.
+        status = OrderStatus(kind, order_id, price, qty, message, stamp)
+        self._order_log.append(order, status)
         return status
 
-    def get_portfolio(self) -> PortfolioState:
-        """Return current simulated portfolio state."""
-        return PortfolioState(cash=self._cash, positions=dict(self._positions))
+    def _price_from_market_data(self, symbol: str) -> float | None:
+        """
+        Fill price for symbol from get_market_data (close, else last); None if no data.
+        Single-symbol frames from load_dataframe (df.attrs['schema_canonical'], no symbol
+        column) skip the schema checks.
+        """
+        df = self.get_market_data([symbol])
+        if df.attrs.get(_SCHEMA_CANONICAL) and "symbol" not in df.columns:
+            close = df.get("close")
+            return float(close.iloc[0]) if close is not None and len(close) else None
+        if df is self._frame:
+            closes, fallback = self._frame_closes
+            return closes.get(symbol, fallback)
+        if df.empty:
+            return None
+        schema = self._schema
+        if schema is None:
+            columns = df.columns
+            schema = ("close" in columns, "symbol" in columns)
+            if not self._strict:
+                self._schema = schema
+        has_close, has_symbol = schema
+        if not has_close:
+            return None
+        if not self._strict:
+            self._frame = df
+            self._frame_closes = _index_closes(df, has_symbol)
+            closes, fallback = self._frame_closes
+            return closes.get(symbol, fallback)
+        if has_symbol:
+            sub = df[df["symbol"] == symbol]
+            row = sub.iloc[0] if len(sub) > 0 else df.iloc[0]
+        else:
+            row = df.iloc[0]
+        return float(row.get("close", row.get("last", 0)))
+
+    def get_portfolio(self, copy: bool = False, reuse: bool = False) -> PortfolioState:
+        """
+        Return current simulated portfolio state.
+
+        By default positions is a read-only snapshot shared between calls and rebuilt only
+        after a fill, so it is consistent with cash and unaffected by later fills; pass
+        copy=True for an independent dict.
+
+        reuse=True returns the same PortfolioState object on every call until the next
+        fill, so polling loops allocate nothing; like the default, it describes the state
+        at the last fill before the call. The shared object is immutable (frozen, with
+        read-only positions). copy=True takes precedence.
+        """
+        if copy:
+            return PortfolioState(cash=self._cash, positions=dict(self._positions))
+        if self._view_version != self._version:
+            self._positions_view = MappingProxyType(dict(self._positions))
+            self._view_version = self._version
+        if reuse:
+            if self._scratch_version != self._version:
+                self._portfolio_scratch = PortfolioState(
+                    cash=self._cash, positions=self._positions_view
+                )
+                self._scratch_version = self._version
+            return self._portfolio_scratch
+        return PortfolioState(cash=self._cash, positions=self._positions_view)
 
     def get_market_data(self, symbols: list[str]) -> pd.DataFrame:
         """Return market data from the injected source."""
@@ -130,4 +510,12 @@ class PaperBrokerAdapter(BrokerAdapter):
 
     def get_order_log(self) -> list[tuple[Order, OrderStatus]]:
         """Return log of all submitted orders and their status (for debugging/reporting)."""
-        return list(self._order_log)
+        return self._order_log.entries()
+
+    def get_order_log_df(self) -> pd.DataFrame:
+        """
+        Order log as a DataFrame, one row per submitted order: symbol, side (+1 buy,
+        -1 sell), quantity, status, fill_price (NaN if none), filled_quantity,
+        timestamp (UTC) and order_id.
+        """
+        return self._order_log.to_dataframe()
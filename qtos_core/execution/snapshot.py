@@ -0,0 +1,72 @@
+"""
+Market snapshots: latest close per symbol, without going through a DataFrame per lookup.
+
+PaperBrokerAdapter prices fills through MarketSnapshot.close(); DataFrames stay at the
+boundary (get_market_data, or DataFrameSnapshot wrapping one).
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from typing import Protocol
+
+import pandas as pd
+
+
+class MarketSnapshot(Protocol):
+    """Latest prices by symbol."""
+
+    def close(self, symbol: str) -> float | None:
+        """Latest close for symbol, or None if there is no quote."""
+        ...
+
+
+class DictSnapshot:
+    """
+    MarketSnapshot over a symbol -> price mapping. The mapping is referenced, not
+    copied, so updates to it are seen by later lookups.
+    """
+
+    __slots__ = ("close", "prices")
+
+    def __init__(self, prices: Mapping[str, float]) -> None:
+        self.prices = prices
+        # Bound dict lookup: close(symbol) is prices.get(symbol) with no extra frame.
+        self.close = prices.get
+
+
+class DataFrameSnapshot:
+    """
+    MarketSnapshot over a get_market_data-style DataFrame: long format (symbol column,
+    last row per symbol wins) or wide format (one column per symbol, last row). Prices
+    come from "close" (else "last"); NaN counts as no quote. The frame is indexed on the
+    first lookup, then every lookup is a dict get.
+    """
+
+    __slots__ = ("_closes", "_df")
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+        self._closes: dict[str, float] | None = None
+
+    def close(self, symbol: str) -> float | None:
+        closes = self._closes
+        if closes is None:
+            closes = self._closes = self._index()
+        return closes.get(symbol)
+
+    def _index(self) -> dict[str, float]:
+        df = self._df
+        if df.empty:
+            return {}
+        if "symbol" in df.columns:
+            col = "close" if "close" in df.columns else "last" if "last" in df.columns else None
+            if col is None:
+                return {}
+            # Later rows overwrite earlier ones, so each symbol keeps its last row.
+            pairs = zip(df["symbol"].tolist(), df[col].astype(float).tolist())
+            closes = dict(pairs)
+        else:
+            closes = pd.to_numeric(df.iloc[-1], errors="coerce").astype(float).to_dict()
+        return {s: p for s, p in closes.items() if not math.isnan(p)}
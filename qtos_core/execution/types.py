@@ -6,56 +6,71 @@ Compatible with backtesting Trade shape so Observers can be reused.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from enum import Enum
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import IntEnum
 from typing import Any
 
 from qtos_core.signal import Side
 
 
-class OrderStatusKind(Enum):
-    """Status of an order submitted to a broker/adapter."""
+class OrderStatusKind(IntEnum):
+    """Status of an order submitted to a broker/adapter. str() gives the lowercase name."""
 
-    PENDING = "pending"
-    FILLED = "filled"
-    PARTIALLY_FILLED = "partially_filled"
-    REJECTED = "rejected"
-    CANCELLED = "cancelled"
+    PENDING = 0
+    FILLED = 1
+    PARTIALLY_FILLED = 2
+    REJECTED = 3
+    CANCELLED = 4
 
+    def __str__(self) -> str:
+        return self.name.lower()
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class OrderStatus:
-    """Result of submitting an order. Immutable."""
+    """
+    Result of submitting an order. Immutable.
+
+    timestamp is a datetime, or an int of nanoseconds since the epoch (time.time_ns())
+    for adapters that stamp cheaply on the hot path; timestamp_dt always gives a datetime.
+    """
 
     status: OrderStatusKind
     order_id: str | None = None
     fill_price: float | None = None
     filled_quantity: float = 0.0
     message: str | None = None
-    timestamp: datetime | None = None
+    timestamp: datetime | int | None = None
+
+    @property
+    def timestamp_dt(self) -> datetime | None:
+        """timestamp as a (local, naive) datetime; converted on access if stored as ns."""
+        ts = self.timestamp
+        if isinstance(ts, int):
+            seconds, ns = divmod(ts, 1_000_000_000)
+            return datetime.fromtimestamp(seconds) + timedelta(microseconds=ns // 1_000)
+        return ts
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PortfolioState:
     """
     Snapshot of portfolio from broker/adapter (cash + positions).
-    Same shape as qtos_core.Portfolio for use with strategies and hooks.
+    Same shape as qtos_core.Portfolio for use with strategies and hooks. Frozen, since
+    adapters may hand the same snapshot to several callers.
     """
 
     cash: float = 0.0
-    positions: dict[str, float] | None = None
-
-    def __post_init__(self) -> None:
-        if self.positions is None:
-            object.__setattr__(self, "positions", {})
+    positions: Mapping[str, float] = field(default_factory=dict)
 
     def position(self, symbol: str) -> float:
         """Quantity held in symbol. 0 if not present."""
         return self.positions.get(symbol, 0.0)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecutedTrade:
     """
     Record of a filled order. Same shape as backtesting.engine.Trade
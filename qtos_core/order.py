@@ -6,19 +6,23 @@ Immutable. The core does not send orders to brokers; it only models them.
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
 
 from qtos_core.signal import Side
 
 
-class OrderType(Enum):
-    MARKET = "market"
-    LIMIT = "limit"
+class OrderType(IntEnum):
+    MARKET = 1
+    LIMIT = 2
 
+    def __str__(self) -> str:
+        return self.name.lower()
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Order:
     """An order as seen by the core. No broker ID; no fill state here."""
 
@@ -28,3 +32,9 @@ class Order:
     order_type: OrderType = OrderType.MARKET
     limit_price: float | None = None
     timestamp: datetime | None = None
+
+    def __post_init__(self) -> None:
+        # Interned symbols compare by identity first in dict lookups (positions, prices).
+        symbol = self.symbol
+        if isinstance(symbol, str):  # str subclasses such as numpy.str_ become plain str
+            object.__setattr__(self, "symbol", sys.intern(str(symbol)))
@@ -6,24 +6,137 @@ The core holds state here; it does not reconcile with a broker.
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping, MutableMapping
 from dataclasses import dataclass, field
 
+import numpy as np
+
+
+class SymbolTable:
+    """Interns symbols to small int ids (0, 1, 2, ...). Ids are stable once assigned."""
+
+    __slots__ = ("_ids", "_symbols")
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._symbols: list[str] = []
+
+    def add(self, symbol: str) -> int:
+        """Id of symbol, assigning the next id if it is new."""
+        idx = self._ids.get(symbol)
+        if idx is None:
+            idx = self._ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return idx
+
+    def get(self, symbol: str) -> int | None:
+        """Id of symbol, or None if it has not been added."""
+        return self._ids.get(symbol)
+
+    def symbol(self, idx: int) -> str:
+        """Symbol for an id."""
+        return self._symbols[idx]
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._symbols)
+
+
+class PositionBook(MutableMapping[str, float]):
+    """
+    Positions as a float64 array indexed by SymbolTable id, with a dict-like view.
+
+    A zero quantity means "no position": such symbols are absent from the mapping
+    view, and deleting a symbol sets its quantity to zero. The array may be longer
+    than the table (spare capacity is zero) and is replaced when it grows, so
+    re-read `array` after adding symbols.
+    """
+
+    __slots__ = ("array", "symbols")
+
+    def __init__(self, positions: Mapping[str, float] | None = None) -> None:
+        self.symbols = SymbolTable()
+        self.array: np.ndarray = np.zeros(0, dtype=np.float64)
+        if positions:
+            for symbol, qty in positions.items():
+                self[symbol] = qty
+
+    def symbol_id(self, symbol: str) -> int:
+        """Id of symbol in `array`; interns it and grows the array if new."""
+        idx = self.symbols.add(symbol)
+        if idx >= len(self.array):
+            grown = np.zeros(max(8, 2 * len(self.array)), dtype=np.float64)
+            grown[: len(self.array)] = self.array
+            self.array = grown
+        return idx
+
+    def __getitem__(self, symbol: str) -> float:
+        idx = self.symbols.get(symbol)
+        if idx is None or self.array[idx] == 0:
+            raise KeyError(symbol)
+        return float(self.array[idx])
+
+    def __setitem__(self, symbol: str, qty: float) -> None:
+        idx = self.symbol_id(symbol)
+        self.array[idx] = qty
+
+    def __delitem__(self, symbol: str) -> None:
+        idx = self.symbols.get(symbol)
+        if idx is None or self.array[idx] == 0:
+            raise KeyError(symbol)
+        self.array[idx] = 0.0
+
+    def __iter__(self) -> Iterator[str]:
+        arr = self.array
+        return (s for i, s in enumerate(self.symbols) if arr[i] != 0)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.array))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
 
 @dataclass
 class Portfolio:
     """
     Cash and positions. Mutable; updated by the engine on fills/settlements.
+
+    `positions` accepts any symbol -> quantity mapping and is stored as a PositionBook:
+    it still reads like a dict, while `positions_arr` exposes the quantities by symbol id
+    for vectorized valuation.
     """
 
     cash: float = 0.0
-    positions: dict[str, float] = field(default_factory=dict)
+    positions: PositionBook = field(default_factory=PositionBook)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.positions, PositionBook):
+            self.positions = PositionBook(self.positions)
+
+    @property
+    def symbols(self) -> SymbolTable:
+        """Symbol ids used to index `positions_arr`."""
+        return self.positions.symbols
+
+    @property
+    def positions_arr(self) -> np.ndarray:
+        """Quantities by symbol id (zero-padded beyond the last symbol)."""
+        return self.positions.array
 
     def position(self, symbol: str) -> float:
         """Quantity held in symbol. 0 if not present."""
-        return self.positions.get(symbol, 0.0)
+        book = self.positions
+        idx = book.symbols.get(symbol)
+        return float(book.array[idx]) if idx is not None else 0.0
 
     def update_position(self, symbol: str, delta: float) -> None:
         """Adjust position by delta (positive = buy)."""
-        self.positions[symbol] = self.position(symbol) + delta
-        if self.positions[symbol] == 0:
-            del self.positions[symbol]
+        book = self.positions
+        idx = book.symbol_id(symbol)
+        book.array[idx] += delta
@@ -4,17 +4,23 @@ Signal: trading intent produced by a strategy.
 Immutable. No execution—just direction, symbol, and size.
 """
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
 
 
-class Side(Enum):
-    BUY = "buy"
-    SELL = "sell"
+class Side(IntEnum):
+    """Trade direction; the value is the sign of the position change (+1 buy, -1 sell)."""
 
+    BUY = 1
+    SELL = -1
 
-@dataclass(frozen=True)
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+@dataclass(frozen=True, slots=True)
 class Signal:
     """Trading intent: what to do, not an order."""
 
@@ -22,3 +28,8 @@ class Signal:
     side: Side
     quantity: float
     timestamp: datetime
+
+    def __post_init__(self) -> None:
+        symbol = self.symbol
+        if isinstance(symbol, str):  # str subclasses such as numpy.str_ become plain str
+            object.__setattr__(self, "symbol", sys.intern(str(symbol)))
@@ -4,12 +4,13 @@ Tests for backtesting: BacktestEngine, PassThroughRiskManager, metrics.
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from backtesting import BacktestEngine, compute_metrics
-from backtesting.engine import PassThroughRiskManager
-from qtos_core import Order, Portfolio, Signal
+from backtesting import BacktestEngine, EquityCurve, compute_metrics
+from backtesting.engine import BarBuffer, PassThroughRiskManager
+from qtos_core import Order, Portfolio, Signal, Strategy
 from qtos_core.order import OrderType
 from qtos_core.signal import Side
 from qtos_core.examples.buy_and_hold import BuyAndHoldStrategy
@@ -55,6 +56,20 @@ def test_pass_through_risk_returns_order_unchanged():
     assert out is o
 
 
+# --- BarBuffer ---
+
+
+def test_bar_buffer_columns_and_fallbacks():
+    df = _make_ohlcv_df(n_days=3)[["close"]]
+    bars = BarBuffer.from_dataframe(df)
+    assert len(bars) == 3
+    assert bars.close.tolist() == [100.5, 101.5, 102.5]
+    assert bars.open is bars.close
+    assert bars.volume.tolist() == [0.0, 0.0, 0.0]
+    assert bars.ts.dtype == "datetime64[ns]"
+    assert bars.datetimes()[0] == datetime(2024, 1, 2)
+
+
 # --- BacktestEngine ---
 
 
@@ -86,6 +101,20 @@ def test_backtest_engine_buy_and_hold_one_fill():
     assert result.portfolio.cash == 100_000.0 - 50 * 100.5  # filled at first bar close
 
 
+def test_backtest_engine_trades_record_array():
+    data = _make_ohlcv_df(n_days=3)
+    engine = BacktestEngine(
+        _EveryBarStrategy(["SPY", "SPY"]), PassThroughRiskManager(), Portfolio(cash=100_000.0)
+    )
+    result = engine.run(data, symbol="SPY")
+    assert len(result.trades) == 6  # two fills per bar outgrow the per-bar buffer
+    assert result.trades.price.tolist() == [100.5, 100.5, 101.5, 101.5, 102.5, 102.5]
+    assert result.trades.timestamp[2] == np.datetime64("2024-01-03")
+    trade = result.trades_as_dataclasses()[0]
+    assert (trade.symbol, trade.side, trade.quantity) == ("SPY", Side.BUY, 1.0)
+    assert trade.timestamp == datetime(2024, 1, 2)
+
+
 def test_backtest_engine_equity_curve_length():
     data = _make_ohlcv_df(n_days=3)
     portfolio = Portfolio(cash=1000.0)
@@ -95,6 +124,175 @@ def test_backtest_engine_equity_curve_length():
     assert len(result.equity_curve) == 3
 
 
+def test_backtest_engine_equity_curve_arrays():
+    data = _make_ohlcv_df(n_days=4)
+    strategy = BuyAndHoldStrategy(symbol="SPY", quantity=10)
+    engine = BacktestEngine(strategy, PassThroughRiskManager(), Portfolio(cash=10_000.0))
+    result = engine.run(data, symbol="SPY")
+    curve = result.equity_curve
+    assert curve.timestamps.dtype == "datetime64[ns]"
+    assert curve.values.dtype == "float64"
+    pairs = list(curve)
+    assert pairs[0] == (datetime(2024, 1, 2), 10_000.0)
+    assert curve[-1] == pairs[-1]
+    assert pairs[-1][1] == 10_000.0 - 10 * 100.5 + 10 * 103.5
+
+
+def test_equity_curve_slices_like_a_list():
+    strategy = BuyAndHoldStrategy(symbol="SPY", quantity=10)
+    engine = BacktestEngine(strategy, PassThroughRiskManager(), Portfolio(cash=10_000.0))
+    result = engine.run(_make_ohlcv_df(n_days=4))
+    pairs = list(result.equity_curve)
+    assert result.equity_curve[:2] == pairs[:2]
+    assert result.equity_curve[1:] == pairs[1:]
+    assert result.equity_curve[::-1] == pairs[::-1]
+    assert result.equity_curve[-2] == pairs[-2]
+    with pytest.raises(IndexError):
+        result.equity_curve[4]
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_equity_curve_keeps_input_timezone(vectorized):
+    data = _make_ohlcv_df(n_days=3)
+    data.index = pd.date_range("2024-01-01", periods=3, freq="D", tz="US/Eastern")
+    strategy = BuyAndHoldStrategy(symbol="SPY", quantity=1)
+    engine = BacktestEngine(strategy, PassThroughRiskManager(), Portfolio(cash=1_000.0))
+    if vectorized:
+        result = engine.run_signals(data, [1, 0, 0], [1.0] * 3)
+    else:
+        result = engine.run(data)
+    first, _ = result.equity_curve[0]
+    assert first == data.index[0]
+    assert first.utcoffset() == data.index[0].utcoffset()
+    assert (first.hour, first.tzinfo is not None) == (0, True)
+    assert [ts for ts, _ in result.equity_curve] == list(data.index)
+    assert result.equity_curve[:1][0][0].hour == 0
+
+
+def test_backtest_engine_values_existing_positions():
+    data = _make_ohlcv_df(n_days=2)
+    portfolio = Portfolio(cash=1000.0, positions={"SPY": 2.0, "QQQ": 5.0})
+    engine = BacktestEngine(BuyAndHoldStrategy(symbol="SPY", quantity=1), PassThroughRiskManager(), portfolio)
+    result = engine.run(data, symbol="SPY")
+    # QQQ has no bars, so it is valued at 0 like any symbol without a price.
+    assert result.equity_curve.values.tolist() == [
+        1000.0 - 100.5 + 3 * 100.5,
+        1000.0 - 100.5 + 3 * 101.5,
+    ]
+
+
+def test_run_signals_matches_run_for_buy_and_hold():
+    data = _make_ohlcv_df(n_days=6)
+    strategy = BuyAndHoldStrategy(symbol="SPY", quantity=50)
+    expected = BacktestEngine(strategy, PassThroughRiskManager(), Portfolio(cash=100_000.0)).run(data)
+    engine = BacktestEngine(strategy, PassThroughRiskManager(), Portfolio(cash=100_000.0))
+    result = engine.run_signals(data, [1, 0, 0, 0, 0, 0], [50.0] * 6)
+    assert [(t.side, t.quantity, t.price) for t in result.trades] == [
+        (t.side, t.quantity, t.price) for t in expected.trades
+    ]
+    assert list(result.equity_curve) == list(expected.equity_curve)
+    assert result.portfolio.cash == expected.portfolio.cash
+    assert result.portfolio.position("SPY") == 50
+
+
+def test_run_signals_caps_sells_and_skips_unaffordable_buys():
+    data = _make_ohlcv_df(n_days=4)
+    seen = []
+    engine = BacktestEngine(
+        BuyAndHoldStrategy(symbol="SPY"),
+        PassThroughRiskManager(),
+        Portfolio(cash=250.0),
+        observers=[lambda trade, portfolio: seen.append(trade)],
+    )
+    result = engine.run_signals(data, [1, 1, -1, -1], [2.0, 5.0, 3.0, 1.0], symbol="SPY")
+    assert result.trades.side.tolist() == [1, -1]
+    assert result.trades.quantity.tolist() == [2.0, 2.0]
+    assert seen == result.trades_as_dataclasses()
+    assert [(t.side, t.quantity) for t in seen] == [(Side.BUY, 2.0), (Side.SELL, 2.0)]
+    assert result.portfolio.position("SPY") == 0.0
+    assert result.portfolio.cash == 250.0 - 2 * 100.5 + 2 * 102.5
+
+
+class _EveryBarStrategy(Strategy):
+    """Buys 1 of each listed symbol on every bar."""
+
+    def __init__(self, symbols):
+        self.symbols = symbols
+
+    def on_event(self, event, portfolio=None):
+        return [
+            Signal(symbol=s, side=Side.BUY, quantity=1.0, timestamp=event.timestamp)
+            for s in self.symbols
+        ]
+
+
+class _AlternatingStrategy(Strategy):
+    """Buys 2 on even bars, sells 2 on odd bars; vectorized, on_event unused."""
+
+    def on_event(self, event, portfolio=None):
+        raise AssertionError("run_vectorized should not call on_event")
+
+    def signals(self, close):
+        return np.where(np.arange(len(close)) % 2 == 0, 2.0, -2.0)
+
+
+def test_run_vectorized_uses_strategy_signals():
+    data = _make_ohlcv_df(n_days=4)
+    engine = BacktestEngine(_AlternatingStrategy(), PassThroughRiskManager(), Portfolio(cash=1000.0))
+    result = engine.run_vectorized(data, symbol="SPY")
+    expected = BacktestEngine(
+        _AlternatingStrategy(), PassThroughRiskManager(), Portfolio(cash=1000.0)
+    ).run_signals(data, [1, -1, 1, -1], [2.0] * 4, symbol="SPY")
+    assert len(result.trades) == 4
+    assert result.equity_curve.values.tolist() == expected.equity_curve.values.tolist()
+    assert result.portfolio.cash == expected.portfolio.cash
+
+
+def test_run_vectorized_falls_back_to_run():
+    data = _make_ohlcv_df(n_days=3)
+    strategy = BuyAndHoldStrategy(symbol="SPY", quantity=5)
+    engine = BacktestEngine(strategy, PassThroughRiskManager(), Portfolio(cash=1000.0))
+    result = engine.run_vectorized(data, symbol="SPY")
+    assert len(result.trades) == 1
+    assert result.portfolio.position("SPY") == 5
+
+
+def test_hook_adding_symbols_mid_bar_keeps_valuation_working():
+    def add_hedges(trade, portfolio):
+        for i in range(10):  # more symbols than the position array's spare capacity
+            portfolio.update_position(f"HEDGE{i}", 1.0)
+
+    strategy = BuyAndHoldStrategy(symbol="SPY", quantity=10)
+    engine = BacktestEngine(
+        strategy, PassThroughRiskManager(), Portfolio(cash=10_000.0), observers=[add_hedges]
+    )
+    result = engine.run(_make_ohlcv_df(n_days=3), symbol="SPY")
+    # The hedges have no bars, so they are valued at 0.
+    assert result.equity_curve.values.tolist() == [
+        10_000.0 - 10 * 100.5 + 10 * 100.5,
+        10_000.0 - 10 * 100.5 + 10 * 101.5,
+        10_000.0 - 10 * 100.5 + 10 * 102.5,
+    ]
+    assert result.portfolio.position("HEDGE9") == 1.0
+
+
+def test_run_with_hooks_matches_bare_run():
+    data = _make_ohlcv_df(n_days=4)
+    bare = BacktestEngine(
+        BuyAndHoldStrategy(symbol="SPY", quantity=5), PassThroughRiskManager(), Portfolio(cash=1000.0)
+    ).run(data)
+    seen = []
+    hooked = BacktestEngine(
+        BuyAndHoldStrategy(symbol="SPY", quantity=5),
+        PassThroughRiskManager(),
+        Portfolio(cash=1000.0),
+        validators=[lambda order, portfolio: order],
+        observers=[lambda trade, portfolio: seen.append(trade)],
+    ).run(data)
+    assert seen == hooked.trades_as_dataclasses() == bare.trades_as_dataclasses()
+    assert hooked.equity_curve.values.tolist() == bare.equity_curve.values.tolist()
+
+
 # --- compute_metrics ---
 
 
@@ -112,8 +310,44 @@ def test_compute_metrics_basic():
     assert m.total_return_pct == 10.0
 
 
+def test_compute_metrics_equity_curve_matches_pairs():
+    curve = [
+        (datetime(2024, 1, 1), 100_000.0),
+        (datetime(2024, 1, 2), 99_000.0),
+        (datetime(2024, 1, 3), 101_000.0),
+        (datetime(2024, 12, 31), 110_000.0),
+    ]
+    arrays = EquityCurve(
+        timestamps=np.array([t for t, _ in curve], dtype="datetime64[ns]"),
+        values=np.array([v for _, v in curve]),
+    )
+    assert compute_metrics(100_000.0, arrays) == compute_metrics(100_000.0, curve)
+
+
+def test_metric_pass_matches_numpy():
+    from backtesting._engine_numba import metric_pass
+
+    rng = np.random.default_rng(0)
+    values = 100_000.0 * np.cumprod(1.0 + rng.normal(0.0, 0.01, size=500))
+    mean, m2, n_ret, max_dd, peak_at_mdd = metric_pass(values, 0.0001)
+    excess = np.diff(values) / values[:-1] - 0.0001
+    peak = np.maximum.accumulate(values)
+    assert n_ret == 499
+    assert mean == pytest.approx(np.mean(excess), rel=1e-9)
+    assert np.sqrt(m2 / n_ret) == pytest.approx(np.std(excess), rel=1e-9)
+    assert max_dd == pytest.approx(np.max(peak - values))
+    assert peak_at_mdd == peak[np.argmax(peak - values)]
+
+
 def test_compute_metrics_empty_curve():
     m = compute_metrics(100_000.0, [])
     assert m.final_value == 100_000.0
     assert m.total_pnl == 0.0
     assert m.sharpe_ratio == 0.0
+
+
+def test_compute_metrics_drawdown_pct_with_zero_start():
+    curve = [(datetime(2024, 1, d), v) for d, v in [(2, 0.0), (3, 0.0), (4, 100.0)]]
+    m = compute_metrics(100.0, curve)
+    assert m.max_drawdown == 0.0
+    assert m.max_drawdown_pct == 0.0
@@ -2,12 +2,15 @@
 Tests for qtos_core: Event, EventLoop, Signal, Order, Portfolio, Strategy.
 """
 
+import sys
 from datetime import datetime
 
+import numpy as np
 import pytest
 
 from qtos_core import Event, EventLoop, Order, Portfolio, Signal, Strategy
 from qtos_core.order import OrderType
+from qtos_core.portfolio import SymbolTable
 from qtos_core.signal import Side
 from qtos_core.examples.buy_and_hold import BuyAndHoldStrategy
 
@@ -28,6 +31,12 @@ def test_event_immutable():
         e.timestamp = datetime(2024, 1, 1)
 
 
+def test_event_parses_string_timestamp():
+    e = Event(timestamp="2024-01-15T10:00:00")
+    assert e.timestamp == datetime(2024, 1, 15, 10, 0, 0)
+    assert not hasattr(e, "__dict__")
+
+
 # --- EventLoop ---
 
 
@@ -53,6 +62,45 @@ def test_event_loop_run():
     assert log == [1, 2]
 
 
+def test_event_loop_run_accepts_generator():
+    log = []
+    loop = EventLoop()
+    loop.subscribe(lambda ev: log.append(("a", ev.payload)))
+    loop.run(Event(timestamp=datetime.now(), payload=i) for i in range(3))
+    loop.subscribe(lambda ev: log.append(("b", ev.payload)))
+    loop.run(Event(timestamp=datetime.now(), payload=i) for i in range(3, 4))
+    assert log == [("a", 0), ("a", 1), ("a", 2), ("a", 3), ("b", 3)]
+
+
+def test_event_loop_subscribe_for_routes_by_payload_type():
+    log = []
+    loop = EventLoop()
+    loop.subscribe_for(int, lambda ev: log.append(("int", ev.payload)))
+    loop.subscribe(lambda ev: log.append(("all", ev.payload)))
+    loop.subscribe_for(str, lambda ev: log.append(("str", ev.payload)))
+    ts = datetime(2024, 1, 1)
+    loop.run([Event(ts, payload=1), Event(ts, payload="x"), Event(ts, payload=True)])
+    loop.dispatch(Event(ts, payload=None))
+    assert log == [
+        ("int", 1),
+        ("all", 1),
+        ("all", "x"),
+        ("str", "x"),
+        ("int", True),  # bool is an int subclass
+        ("all", True),
+        ("all", None),
+    ]
+
+
+def test_event_loop_single_typed_handler_skips_other_payloads():
+    log = []
+    loop = EventLoop()
+    loop.subscribe_for(int, lambda ev: log.append(ev.payload))
+    ts = datetime(2024, 1, 1)
+    loop.run([Event(ts, payload=1), Event(ts, payload="x"), Event(ts, payload=2)])
+    assert log == [1, 2]
+
+
 # --- Signal & Order ---
 
 
@@ -65,6 +113,26 @@ def test_signal_creation():
     assert s.timestamp == ts
 
 
+def test_side_and_order_type_are_int_enums_with_lowercase_str():
+    assert Side.BUY == 1 and Side.SELL == -1
+    assert 3.0 * Side.SELL == -3.0
+    assert f"{Side.BUY} {OrderType.LIMIT}" == "buy limit"
+    s = Signal(symbol="SPY", side=Side.SELL, quantity=1.0, timestamp=datetime(2024, 1, 1))
+    assert not hasattr(s, "__dict__")
+
+
+def test_order_and_signal_intern_symbols():
+    sym = b"BRK.B".decode()  # built at runtime, so not interned already
+    assert Order(symbol=sym, side=Side.BUY, quantity=1.0).symbol is sys.intern("BRK.B")
+    sig = Signal(symbol=sym, side=Side.BUY, quantity=1.0, timestamp=datetime(2024, 1, 1))
+    assert sig.symbol is sys.intern("BRK.B")
+    # numpy.str_, e.g. read back from BacktestResult.trades.symbol
+    np_sym = np.str_("BRK.B")
+    assert Order(symbol=np_sym, side=Side.BUY, quantity=1.0).symbol is sys.intern("BRK.B")
+    sig = Signal(symbol=np_sym, side=Side.BUY, quantity=1.0, timestamp=datetime(2024, 1, 1))
+    assert type(sig.symbol) is str and sig.symbol == "BRK.B"
+
+
 def test_order_creation():
     o = Order(symbol="SPY", side=Side.SELL, quantity=5.0, order_type=OrderType.MARKET)
     assert o.symbol == "SPY"
@@ -100,6 +168,31 @@ def test_portfolio_update_position_sell():
     assert "SPY" not in p.positions
 
 
+def test_symbol_table_ids_are_stable():
+    t = SymbolTable()
+    assert t.add("SPY") == 0
+    assert t.add("QQQ") == 1
+    assert t.add("SPY") == 0
+    assert t.get("IWM") is None
+    assert t.symbol(1) == "QQQ"
+    assert list(t) == ["SPY", "QQQ"]
+
+
+def test_portfolio_positions_array_matches_mapping():
+    p = Portfolio(cash=0.0, positions={"SPY": 10.0})
+    for i in range(20):
+        p.update_position(f"S{i}", 1.0)
+    p.update_position("SPY", -10.0)
+    assert len(p.positions) == 20
+    assert "SPY" not in p.positions
+    assert p.positions_arr[p.symbols.get("S3")] == 1.0
+    assert float(p.positions_arr.sum()) == 20.0
+    p.positions["SPY"] = 2.0
+    assert dict(p.positions)["SPY"] == 2.0
+    del p.positions["SPY"]
+    assert p.position("SPY") == 0.0
+
+
 # --- BuyAndHoldStrategy ---
 
 
@@ -2,12 +2,13 @@
 Tests for backtesting data_loader: load_csv, load_dataframe.
 """
 
+import io
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
-from backtesting.data_loader import load_csv, load_dataframe
+from backtesting.data_loader import load_csv, load_dataframe, load_parquet
 
 
 def test_load_dataframe_normalizes_columns():
@@ -46,6 +47,21 @@ def test_load_dataframe_aliases():
     assert out.attrs.get("symbol") == "QQQ"
 
 
+def test_load_dataframe_canonical_layout():
+    df = pd.DataFrame({
+        "datetime": pd.date_range("2024-01-01", periods=3, freq="D"),
+        "C": [100, 101, 102],
+        "o": [99.5, 100.5, 101.5],
+        "Vol": [1_000, 2_000, 3_000],
+    }).set_index("datetime")
+    out = load_dataframe(df)
+    assert out.attrs.get("schema_canonical") is True
+    assert (out.dtypes == "float64").all()
+    assert out["close"].to_numpy().flags["C_CONTIGUOUS"]
+    assert out["volume"].tolist() == [1_000.0, 2_000.0, 3_000.0]
+    assert "schema_canonical" not in df.attrs
+
+
 def test_load_csv_uses_sample_data():
     """Use the existing sample CSV in examples/data if present."""
     csv_path = Path(__file__).resolve().parent.parent / "examples" / "data" / "sample_ohlcv.csv"
@@ -56,3 +72,61 @@ def test_load_csv_uses_sample_data():
     assert "close" in df.columns
     assert isinstance(df.index, pd.DatetimeIndex)
     assert df.attrs.get("symbol") == "SPY"
+
+
+def test_load_csv_aliases_and_float_columns(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text(
+        "Date,O,H,L,C,Vol\n"
+        "2024-01-03,101,103,100,102,2000\n"
+        "2024-01-02,100,102,99,101,1000\n"
+    )
+    df = load_csv(csv_path, symbol="SPY")
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert all(df[c].dtype == "float64" for c in df.columns)
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df.index.is_monotonic_increasing
+    assert df["close"].tolist() == [101.0, 102.0]
+
+
+def test_load_csv_from_buffers():
+    text = "Date,Close\n2024-01-02,101\n2024-01-03,102\n"
+    for buf in (io.StringIO(text), io.BytesIO(text.encode())):
+        df = load_csv(buf, symbol="SPY")
+        assert df["close"].tolist() == [101.0, 102.0]
+        assert isinstance(df.index, pd.DatetimeIndex)
+
+
+def test_load_csv_datetime_format(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text("datetime,close\n02/01/2024,101\n03/01/2024,102\n")
+    df = load_csv(csv_path, datetime_format="%d/%m/%Y")
+    assert df.index[0] == pd.Timestamp("2024-01-02")
+    assert df.index.name == "datetime"
+
+
+def test_load_parquet_index_and_column_pruning(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "bars.parquet"
+    df = pd.DataFrame(
+        {"Open": [101.0, 100.0], "Close": [102.0, 101.0], "Volume": [2e6, 1e6], "note": ["x", "y"]},
+        index=pd.DatetimeIndex(["2024-01-03", "2024-01-02"], name="datetime"),
+    )
+    df.to_parquet(path)
+    out = load_parquet(path, columns=("open", "close"), symbol="SPY")
+    assert list(out.columns) == ["open", "close"]
+    assert out.index.is_monotonic_increasing
+    assert out["close"].tolist() == [101.0, 102.0]
+    assert out.attrs.get("symbol") == "SPY"
+
+
+def test_load_parquet_date_column(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "bars.parquet"
+    pd.DataFrame({"Date": ["2024-01-02", "2024-01-03"], "c": [101.0, 102.0]}).to_parquet(
+        path, index=False
+    )
+    out = load_parquet(path)
+    assert isinstance(out.index, pd.DatetimeIndex)
+    assert out.index.name == "datetime"
+    assert list(out.columns) == ["close"]
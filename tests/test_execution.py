@@ -2,14 +2,30 @@
 Tests for execution layer: PaperBrokerAdapter, ExecutionEngine, types.
 """
 
+import asyncio
+import dataclasses
+import threading
 from datetime import datetime
 
-from qtos_core import Order, Portfolio
+import pandas as pd
+import pytest
+
+from qtos_core import Order, Portfolio, Signal, Strategy
 from qtos_core.order import OrderType
 from qtos_core.signal import Side
-from qtos_core.execution import ExecutionEngine, PaperBrokerAdapter
+from qtos_core.execution import (
+    BrokerAdapter,
+    CoalescingBrokerProxy,
+    DataFrameSnapshot,
+    DictSnapshot,
+    ExecutionEngine,
+    LiveBrokerAdapter,
+    PaperBrokerAdapter,
+)
+from qtos_core.execution import paper as paper_module
 from qtos_core.execution.types import OrderStatusKind, PortfolioState
 from qtos_core.examples.buy_and_hold import BuyAndHoldStrategy
+from backtesting.data_loader import load_dataframe
 from backtesting.engine import PassThroughRiskManager
 
 
@@ -43,6 +59,238 @@ def test_paper_broker_submit_sell_fill():
     assert state.position("SPY") == 10.0
 
 
+def test_paper_broker_latest_prices_fill_without_dataframes():
+    prices = {"SPY": 400.0}
+    broker = PaperBrokerAdapter(initial_cash=10_000.0, latest_prices=prices)
+    broker.get_market_data = lambda syms: pytest.fail("fill should read latest_prices directly")
+    prices["SPY"] = 410.0
+    status = broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    assert status.fill_price == 410.0
+    assert broker.submit_order(Order(symbol="QQQ", side=Side.BUY, quantity=1.0)).message == (
+        "No market data for symbol"
+    )
+
+    class HalfPriceBroker(PaperBrokerAdapter):
+        def get_market_data(self, symbols):
+            df = super().get_market_data(symbols)
+            df["close"] = df["close"] / 2
+            return df
+
+    overridden = HalfPriceBroker(initial_cash=10_000.0, latest_prices=prices)
+    assert overridden.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0)).fill_price == 205.0
+
+
+def test_paper_broker_market_data_from_latest_prices():
+    broker = PaperBrokerAdapter(latest_prices={"SPY": 400.0, "QQQ": 300.0, "IWM": 200.0})
+    df = broker.get_market_data(["IWM", "TLT", "SPY", "IWM"])
+    assert list(df["symbol"]) == ["IWM", "SPY"]
+    assert list(df.columns) == ["symbol", "open", "high", "low", "close", "volume"]
+    df["close"] *= 2
+    assert list(df["open"]) == [200.0, 400.0]
+    df.loc[0, "open"] = 99.0
+    df.loc[1, "high"] = 7.0  # each column owns its array: no write shows up in another
+    assert list(df["open"]) == [99.0, 400.0]
+    assert list(df["high"]) == [200.0, 7.0]
+    assert list(df["low"]) == [200.0, 400.0]
+    assert list(df["close"]) == [400.0, 800.0]
+    assert broker.get_market_data(["TLT"]).empty
+
+
+def test_paper_broker_stamps_status_in_nanoseconds_by_default():
+    broker = PaperBrokerAdapter(initial_cash=1_000.0, latest_prices={"SPY": 10.0})
+    before = datetime.now()
+    status = broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    assert isinstance(status.timestamp, int)
+    assert before <= status.timestamp_dt <= datetime.now()
+    ts = datetime(2024, 1, 2)
+    status = broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0), now=ts)
+    assert status.timestamp == status.timestamp_dt == ts
+
+
+def test_paper_broker_portfolio_snapshot_and_copy():
+    broker = PaperBrokerAdapter(initial_cash=1_000.0, latest_prices={"SPY": 10.0})
+    view = broker.get_portfolio()
+    snapshot = broker.get_portfolio(copy=True)
+    assert broker.get_portfolio().positions is view.positions  # shared until a fill
+    broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=5.0))
+    # Earlier snapshots keep cash and positions from the same moment.
+    assert (view.cash, view.positions) == (1_000.0, {})
+    assert (snapshot.cash, snapshot.positions) == (1_000.0, {})
+    after = broker.get_portfolio()
+    assert (after.cash, after.positions) == (950.0, {"SPY": 5.0})
+    assert after.positions is not view.positions
+    assert broker.get_portfolio().positions is after.positions
+    with pytest.raises(TypeError):
+        after.positions["SPY"] = 7.0
+
+
+def test_paper_broker_reused_portfolio_until_fill():
+    broker = PaperBrokerAdapter(initial_cash=1_000.0, latest_prices={"SPY": 10.0, "QQQ": 0.0})
+    first = broker.get_portfolio(reuse=True)
+    assert broker.get_portfolio(reuse=True) is first
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.cash = 0.0  # shared between callers, so it cannot be changed
+    with pytest.raises(TypeError):
+        first.positions["SPY"] = 1.0
+    broker.submit_order(Order(symbol="QQQ", side=Side.BUY, quantity=1.0))  # rejected
+    assert broker.get_portfolio(reuse=True) is first
+    broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=2.0))
+    after = broker.get_portfolio(reuse=True)
+    assert after is not first
+    assert (first.cash, first.positions) == (1_000.0, {})  # not torn by the fill
+    assert after == broker.get_portfolio()
+    assert (after.cash, dict(after.positions)) == (980.0, {"SPY": 2.0})
+    broker.submit_order(Order(symbol="SPY", side=Side.SELL, quantity=2.0))
+    assert (after.cash, dict(after.positions)) == (980.0, {"SPY": 2.0})
+    assert broker.get_portfolio(reuse=True).positions == {}
+
+
+def test_paper_broker_order_log_round_trips_and_exports_dataframe():
+    broker = PaperBrokerAdapter(initial_cash=100.0, latest_prices={"SPY": 10.0})
+    ts = datetime(2024, 1, 2, 9, 30)
+    buy = Order(symbol="SPY", side=Side.BUY, quantity=2.0)
+    sell = Order(symbol="SPY", side=Side.SELL, quantity=5.0)
+    statuses = [broker.submit_order(buy), broker.submit_order(sell, now=ts)]
+    assert broker.get_order_log() == list(zip([buy, sell], statuses))
+
+    df = broker.get_order_log_df()
+    assert list(df["symbol"]) == ["SPY", "SPY"]
+    assert list(df["side"]) == [1, -1]
+    assert list(df["status"]) == ["filled", "rejected"]
+    assert df["fill_price"].iloc[0] == 10.0 and pd.isna(df["fill_price"].iloc[1])
+    assert df["timestamp"].iloc[1] == pd.Timestamp(ts.astimezone())
+
+
+@pytest.mark.parametrize("use_kernel", [False, True])
+def test_paper_broker_submit_orders_matches_sequential_submits(monkeypatch, use_kernel):
+    if use_kernel:  # the kernel also runs (uncompiled) without numba
+        monkeypatch.setattr(paper_module, "_NUMBA", True)
+        monkeypatch.setattr(paper_module, "_KERNEL_MIN_BATCH", 1)
+    prices = {"SPY": 400.0, "QQQ": 300.0, "BAD": 0.0}
+    orders = [
+        Order(symbol="SPY", side=Side.BUY, quantity=10.0),
+        Order(symbol="QQQ", side=Side.SELL, quantity=1.0),  # nothing held yet
+        Order(symbol="QQQ", side=Side.BUY, quantity=5.0),
+        Order(symbol="SPY", side=Side.BUY, quantity=20.0),  # not enough cash left
+        Order(symbol="SPY", side=Side.SELL, quantity=10.0),  # flattens SPY
+        Order(symbol="SPY", side=Side.BUY, quantity=5.0),  # paid for by the sale
+        Order(symbol="BAD", side=Side.BUY, quantity=1.0),
+        Order(symbol="TLT", side=Side.BUY, quantity=1.0),
+    ]
+    ts = datetime(2024, 1, 2)
+    batch = PaperBrokerAdapter(initial_cash=6_000.0, latest_prices=prices)
+    single = PaperBrokerAdapter(initial_cash=6_000.0, latest_prices=prices)
+    assert batch.get_portfolio().positions == {}  # cached before the batch fills
+    got = batch.submit_orders(orders, now=ts)
+    expected = [single.submit_order(o, now=ts) for o in orders]
+
+    def strip(st):
+        return (st.status, st.fill_price, st.filled_quantity, st.message, st.timestamp)
+
+    assert [strip(st) for st in got] == [strip(st) for st in expected]
+    assert batch.get_portfolio(copy=True) == single.get_portfolio(copy=True)
+    assert batch.get_portfolio() == single.get_portfolio(copy=True)
+    assert len(batch.get_order_log()) == len(orders)
+
+
+def test_market_snapshots_price_paper_fills():
+    long_df = pd.DataFrame(
+        {"symbol": ["SPY", "QQQ", "SPY", "IWM"], "close": [400.0, 300.0, 401.0, float("nan")]}
+    )
+    snap = DataFrameSnapshot(long_df)
+    assert (snap.close("SPY"), snap.close("QQQ"), snap.close("IWM")) == (401.0, 300.0, None)
+    wide = DataFrameSnapshot(pd.DataFrame({"SPY": [400.0, 402.0], "label": ["a", "b"]}))
+    assert (wide.close("SPY"), wide.close("label")) == (402.0, None)
+    assert DictSnapshot({"SPY": 1.0}).close("QQQ") is None
+
+    broker = PaperBrokerAdapter(initial_cash=1_000.0, market_snapshot=snap)
+    assert broker.submit_order(Order(symbol="QQQ", side=Side.BUY, quantity=1.0)).fill_price == 300.0
+    assert broker.submit_order(Order(symbol="IWM", side=Side.BUY, quantity=1.0)).message == (
+        "No market data for symbol"
+    )
+    assert list(broker.get_market_data(["QQQ", "IWM"])["close"]) == [300.0]
+
+
+def test_paper_order_ids_are_unique_per_adapter():
+    brokers = [PaperBrokerAdapter(initial_cash=1_000.0, latest_prices={"SPY": 1.0}) for _ in range(2)]
+    order = Order(symbol="SPY", side=Side.BUY, quantity=1.0)
+    ids = [b.submit_order(order).order_id for b in brokers for _ in range(3)]
+    ids += [st.order_id for st in brokers[0].submit_orders([order, order])]
+    assert len(set(ids)) == len(ids)
+    assert all(i.startswith("paper-") for i in ids)
+
+
+@pytest.mark.parametrize("strict", [True, False])
+def test_paper_broker_market_data_schema_check(strict):
+    frames = iter([
+        pd.DataFrame({"symbol": ["SPY"], "close": [400.0]}),
+        pd.DataFrame({"symbol": ["SPY"], "last": [401.0]}),  # schema changed
+    ])
+    broker = PaperBrokerAdapter(
+        initial_cash=1_000.0, market_data_source=lambda syms: next(frames), strict=strict
+    )
+    order = Order(symbol="SPY", side=Side.BUY, quantity=1.0)
+    assert broker.submit_order(order).fill_price == 400.0
+    second = broker.submit_order(order)
+    if strict:
+        assert second.message == "No market data for symbol"
+    else:  # the cached schema says "close" exists, so the row's fallback column is used
+        assert second.fill_price == 401.0
+
+
+def test_paper_broker_reuses_unchanged_market_data_frame():
+    df = pd.DataFrame({"symbol": ["SPY", "QQQ", "SPY"], "close": [400.0, 300.0, 999.0]})
+    calls = []
+
+    def source(symbols):
+        calls.append(symbols)
+        return df
+
+    broker = PaperBrokerAdapter(initial_cash=10_000.0, market_data_source=source, strict=False)
+    for symbol in ("SPY", "QQQ", "SPY"):
+        broker.submit_order(Order(symbol=symbol, side=Side.BUY, quantity=1.0))
+    assert len(calls) == 3  # the source is still asked every time
+    prices = [s.fill_price for _, s in broker.get_order_log()]
+    assert prices == [400.0, 300.0, 400.0]  # first row per symbol, as in strict mode
+    # Same results as the default strict adapter.
+    strict = PaperBrokerAdapter(initial_cash=10_000.0, market_data_source=source)
+    for symbol in ("SPY", "QQQ", "SPY", "IWM"):
+        strict.submit_order(Order(symbol=symbol, side=Side.BUY, quantity=1.0))
+        broker.submit_order(Order(symbol=symbol, side=Side.BUY, quantity=1.0))
+    assert [s.fill_price for _, s in strict.get_order_log()] == prices + [400.0]
+    assert [s.fill_price for _, s in broker.get_order_log()][3:] == prices + [400.0]
+
+
+def test_paper_broker_prices_canonical_frames():
+    raw = pd.DataFrame(
+        {"C": [400.0, 401.0], "O": [399.0, 400.0]},
+        index=pd.date_range("2024-01-01", periods=2, freq="D"),
+    )
+    bars = load_dataframe(raw)
+    broker = PaperBrokerAdapter(initial_cash=1_000.0, market_data_source=lambda syms: bars)
+    status = broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    assert status.fill_price == 400.0  # first row, as for any frame without a symbol column
+    empty = PaperBrokerAdapter(
+        initial_cash=1_000.0, market_data_source=lambda syms: bars.iloc[:0]
+    )
+    status = empty.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    assert status.status == OrderStatusKind.REJECTED
+
+
+def test_paper_broker_filters_multi_symbol_frames_built_from_canonical_ones():
+    index = pd.date_range("2024-01-01", periods=1, freq="D")
+    a = load_dataframe(pd.DataFrame({"close": [10.0]}, index=index))
+    b = load_dataframe(pd.DataFrame({"close": [500.0]}, index=index))
+    both = pd.concat([a, b])
+    both["symbol"] = ["A", "B"]
+    assert both.attrs.get("schema_canonical")  # propagated by pandas
+    broker = PaperBrokerAdapter(initial_cash=10_000.0, market_data_source=lambda syms: both)
+    status = broker.submit_order(Order(symbol="B", side=Side.BUY, quantity=1.0))
+    assert status.fill_price == 500.0
+    status = broker.submit_order(Order(symbol="A", side=Side.BUY, quantity=1.0))
+    assert status.fill_price == 10.0
+
+
 def test_paper_broker_rejects_no_market_data():
     broker = PaperBrokerAdapter(initial_cash=100_000.0)  # no latest_prices
     order = Order(symbol="SPY", side=Side.BUY, quantity=10.0, order_type=OrderType.MARKET)
@@ -76,3 +324,431 @@ def test_execution_engine_kill_switch_blocks_orders():
     state = broker.get_portfolio()
     assert state.position("SPY") == 0.0
     assert state.cash == 100_000.0  # no order submitted; kill switch causes early return
+
+
+class _NoSignalStrategy(Strategy):
+    """Never trades."""
+
+    def on_event(self, event, portfolio=None):
+        return []
+
+
+def test_idle_cycle_only_calls_advisors_that_emit_signals():
+    broker = PaperBrokerAdapter(initial_cash=10_000.0, latest_prices={"SPY": 400.0})
+    calls = []
+
+    def passive(signals, event, portfolio):
+        calls.append("passive")
+        return signals
+
+    class Rebalancer:
+        emits_signals = True
+
+        def __call__(self, signals, event, portfolio):
+            calls.append("rebalancer")
+            return [Signal(symbol="SPY", side=Side.BUY, quantity=1.0, timestamp=event.timestamp)]
+
+    engine = ExecutionEngine(
+        _NoSignalStrategy(), PassThroughRiskManager(), broker, advisors=[passive]
+    )
+    engine.run_once(["SPY"])
+    assert calls == []
+
+    engine.advisors = [passive, Rebalancer(), passive]
+    engine.run_once(["SPY"])
+    assert calls == ["rebalancer", "passive"]
+    assert broker.get_portfolio().position("SPY") == 1.0
+
+
+class _BuyEachStrategy(Strategy):
+    """Buys quantity of every symbol in the event payload."""
+
+    def __init__(self, quantity: float) -> None:
+        self.quantity = quantity
+
+    def on_event(self, event, portfolio=None):
+        return [
+            Signal(symbol=sym, side=Side.BUY, quantity=self.quantity, timestamp=event.timestamp)
+            for sym in event.payload
+        ]
+
+
+class _BatchRecordingBroker(PaperBrokerAdapter):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.batches: list[list[str]] = []
+
+    def submit_orders(self, orders, *, now=None):
+        self.batches.append([o.symbol for o in orders])
+        return super().submit_orders(orders, now=now)
+
+
+def test_execution_engine_submits_one_batch_per_cycle():
+    broker = _BatchRecordingBroker(
+        initial_cash=8_000.0, latest_prices={"SPY": 400.0, "QQQ": 300.0, "IWM": 200.0}
+    )
+    seen = []
+    engine = ExecutionEngine(
+        _BuyEachStrategy(quantity=10),
+        PassThroughRiskManager(),
+        broker,
+        observers=[lambda trade, portfolio: seen.append(trade.symbol)],
+    )
+    engine.run_once(["SPY", "QQQ", "IWM"])
+    assert broker.batches == [["SPY", "QQQ", "IWM"]]
+    # 4000 + 3000 fill; IWM (2000) exceeds the 1000 cash left and is rejected by the broker.
+    assert seen == ["SPY", "QQQ"]
+    assert [e.reason for e in engine.get_rejected_log()] == ["Insufficient cash"]
+
+
+def test_order_statuses_carry_cycle_timestamp():
+    ts = datetime(2024, 1, 2, 15, 30)
+    broker = PaperBrokerAdapter(initial_cash=10_000.0, latest_prices={"SPY": 400.0, "QQQ": 300.0})
+    engine = ExecutionEngine(_BuyEachStrategy(quantity=1), PassThroughRiskManager(), broker)
+    engine.run_once(["SPY", "QQQ"], event_timestamp=ts)
+    assert [st.timestamp for _, st in broker.get_order_log()] == [ts, ts]
+
+    live = LiveBrokerAdapter("key", "secret", initial_cash=1_000.0)
+    live.prime_quotes({"SPY": 10.0})
+    orders = [Order(symbol="SPY", side=side, quantity=1.0) for side in (Side.BUY, Side.SELL)]
+    assert [st.timestamp for st in live.submit_orders(orders, now=ts)] == [ts, ts]
+    assert live.submit_order(orders[0], now=ts).timestamp == ts
+
+
+def test_live_broker_submit_orders_blocked_when_live_disabled(monkeypatch):
+    monkeypatch.delenv("QTOS_LIVE_TRADING_ENABLED", raising=False)
+    broker = LiveBrokerAdapter("key", "secret", sandbox=False)
+    orders = [Order(symbol=s, side=Side.BUY, quantity=1.0) for s in ("SPY", "QQQ")]
+    statuses = broker.submit_orders(orders)
+    assert [st.status for st in statuses] == [OrderStatusKind.REJECTED] * 2
+    assert broker.submit_orders([]) == []
+
+
+def test_live_broker_resolves_mapped_and_unmapped_symbols():
+    mapped = LiveBrokerAdapter("key", "secret", symbol_map={"BTC": "BTCUSD"})
+    assert mapped._resolve("BTC", "BTC") == "BTCUSD"
+    assert mapped._resolve("SPY", "SPY") == "SPY"
+    assert LiveBrokerAdapter("key", "secret")._resolve("BTC", "BTC") == "BTC"
+
+
+def test_live_sandbox_positions_read_back_as_plain_dict():
+    broker = LiveBrokerAdapter("key", "secret", initial_cash=100.0)
+    broker.prime_quotes({"SPY": 10.0, "QQQ": 20.0})
+    broker.submit_order(Order(symbol="QQQ", side=Side.SELL, quantity=1.0))  # nothing held
+    broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=2.0))
+    broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    state = broker.get_portfolio()
+    assert type(state.positions) is dict
+    assert state.positions == {"SPY": 3.0}
+    broker.submit_order(Order(symbol="SPY", side=Side.SELL, quantity=3.0))
+    assert broker.get_portfolio().positions == {}
+
+
+def test_execution_engine_primes_live_quotes():
+    fetched = []
+
+    def source(symbols):
+        fetched.append(list(symbols))
+        return pd.DataFrame({"symbol": symbols, "close": [400.0] * len(symbols)})
+
+    broker = LiveBrokerAdapter("key", "secret", initial_cash=10_000.0, market_data_source=source)
+    engine = ExecutionEngine(BuyAndHoldStrategy(symbol="SPY", quantity=5), PassThroughRiskManager(), broker)
+    engine.run_once(["SPY"])
+    assert fetched == [["SPY"]]  # the sandbox fill reused the engine's quote
+    assert broker.get_portfolio().cash == 10_000.0 - 5 * 400.0
+
+
+def test_live_quotes_do_not_outlive_the_cycle():
+    price = {"SPY": 400.0}
+
+    def source(symbols):
+        return pd.DataFrame({"symbol": symbols, "close": [price[s] for s in symbols]})
+
+    broker = LiveBrokerAdapter("key", "secret", initial_cash=10_000.0, market_data_source=source)
+    engine = ExecutionEngine(BuyAndHoldStrategy(symbol="SPY", quantity=5), PassThroughRiskManager(), broker)
+    engine.run_once(["SPY"])
+    price["SPY"] = 410.0
+    status = broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    assert status.fill_price == 410.0  # fetched again, not the last cycle's quote
+    asyncio.run(engine.run_once_async(["SPY"]))
+    price["SPY"] = 420.0
+    status = broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    assert status.fill_price == 420.0
+
+
+def test_prices_from_market_data_uses_last_row_per_symbol():
+    long_df = pd.DataFrame(
+        {"symbol": ["SPY", "QQQ", "SPY", "QQQ"], "close": [400.0, 300.0, 401.0, 302.0]}
+    )
+    broker = PaperBrokerAdapter(market_data_source=lambda syms: long_df)
+    engine = ExecutionEngine(BuyAndHoldStrategy(symbol="SPY"), PassThroughRiskManager(), broker)
+    assert engine._prices_from_market_data(["SPY", "QQQ", "IWM"]) == {"SPY": 401.0, "QQQ": 302.0}
+
+    gappy_df = pd.DataFrame({"symbol": ["SPY", "QQQ", "QQQ"], "close": [400.0, 300.0, float("nan")]})
+    broker = PaperBrokerAdapter(market_data_source=lambda syms: gappy_df)
+    engine = ExecutionEngine(BuyAndHoldStrategy(symbol="SPY"), PassThroughRiskManager(), broker)
+    assert engine._prices_from_market_data(["SPY", "QQQ"]) == {"SPY": 400.0}
+
+    wide_df = pd.DataFrame({"SPY": [400.0, 401.0], "close": [1.0, 2.0]})
+    broker = PaperBrokerAdapter(market_data_source=lambda syms: wide_df)
+    engine = ExecutionEngine(BuyAndHoldStrategy(symbol="SPY"), PassThroughRiskManager(), broker)
+    assert engine._prices_from_market_data(["SPY", "IWM"]) == {"SPY": 401.0, "IWM": 2.0}
+
+
+def test_current_equity_tracks_changing_symbol_sets():
+    broker = PaperBrokerAdapter(latest_prices={"SPY": 400.0})
+    engine = ExecutionEngine(BuyAndHoldStrategy(symbol="SPY"), PassThroughRiskManager(), broker)
+    state = PortfolioState(cash=100.0, positions={"SPY": 2.0, "QQQ": 1.0})
+    assert engine._current_equity(state, {"SPY": 400.0}) == 900.0
+    assert engine._current_equity(state, {"QQQ": 300.0, "SPY": 401.0}) == 1202.0
+    state = PortfolioState(cash=0.0, positions={"IWM": -3.0})
+    assert engine._current_equity(state, {"IWM": 10.0, "SPY": 401.0}) == -30.0
+
+
+def test_rejected_log_keeps_most_recent_entries():
+    broker = PaperBrokerAdapter(initial_cash=0.0, latest_prices={"SPY": 400.0})
+    engine = ExecutionEngine(
+        _BuyEachStrategy(quantity=1), PassThroughRiskManager(), broker, rejected_log_capacity=2
+    )
+    for ts in (datetime(2024, 1, d) for d in (2, 3, 4)):
+        engine.run_once(["SPY"], event_timestamp=ts)
+    log = engine.get_rejected_log()
+    assert [e.timestamp.day for e in log] == [3, 4]
+    assert not hasattr(log[0], "__dict__")
+    with pytest.raises(AttributeError):
+        log[0].reason = "edited"
+
+
+def test_daily_pnl_limit_blocks_all_signals():
+    prices = {"SPY": 400.0}
+    broker = PaperBrokerAdapter(initial_cash=10_000.0, latest_prices=prices)
+    broker.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=10.0))
+    engine = ExecutionEngine(
+        _BuyEachStrategy(quantity=1), PassThroughRiskManager(), broker, daily_pnl_limit=500.0
+    )
+    engine.reset_daily_pnl_baseline()
+    prices["SPY"] = 340.0  # 10 * -60 = -600 PnL, past the 500 limit
+    engine.run_once(["SPY"])
+    log = engine.get_rejected_log()
+    assert [(e.reason, e.signal.symbol) for e in log] == [("daily_pnl_limit", "SPY")]
+    assert broker.get_portfolio().position("SPY") == 10.0
+
+
+def test_live_broker_concurrent_submit_orders_keeps_order_and_state():
+    broker = LiveBrokerAdapter("key", "secret", initial_cash=1_000.0, max_concurrency=4)
+    broker.prime_quotes({"SPY": 10.0, "QQQ": 20.0})
+    orders = [Order(symbol=s, side=Side.BUY, quantity=1.0) for s in ["SPY", "QQQ"] * 20]
+    statuses = broker.submit_orders(orders)
+    broker.close()
+    assert [st.fill_price for st in statuses] == [10.0, 20.0] * 20
+    state = broker.get_portfolio()
+    assert state.positions == {"SPY": 20.0, "QQQ": 20.0}
+    assert state.cash == 1_000.0 - 20 * 30.0
+
+
+def test_live_broker_concurrent_fills_never_overspend_cash():
+    broker = LiveBrokerAdapter("key", "secret", initial_cash=100.0, max_concurrency=8)
+    broker.prime_quotes({"SPY": 10.0, "QQQ": 10.0})
+    orders = [Order(symbol=s, side=Side.BUY, quantity=1.0) for s in ["SPY", "QQQ"] * 20]
+    statuses = broker.submit_orders(orders)
+    broker.close()
+    filled = [st for st in statuses if st.status == OrderStatusKind.FILLED]
+    state = broker.get_portfolio()
+    assert len(filled) == 10
+    assert state.cash == 0.0
+    assert sum(state.positions.values()) == 10.0
+
+
+def test_run_once_payload_is_read_only_and_reused():
+    payloads = []
+
+    class _Recorder(Strategy):
+        def on_event(self, event, portfolio=None):
+            payloads.append((event.payload, dict(event.payload)))
+            return []
+
+    broker = PaperBrokerAdapter(initial_cash=0.0, latest_prices={"SPY": 400.0, "QQQ": 300.0})
+    engine = ExecutionEngine(_Recorder(), PassThroughRiskManager(), broker)
+    engine.run_once(["SPY", "QQQ"])
+    engine.run_once(["QQQ"])
+    (first, first_copy), (second, second_copy) = payloads
+    assert first_copy == {"SPY": 400.0, "QQQ": 300.0}
+    assert second_copy == {"QQQ": 300.0}
+    assert first is second
+    with pytest.raises(TypeError):
+        first["SPY"] = 1.0
+
+
+def test_execution_engine_run_once_async():
+    broker = PaperBrokerAdapter(initial_cash=100_000.0, latest_prices={"SPY": 400.0})
+    engine = ExecutionEngine(BuyAndHoldStrategy(symbol="SPY", quantity=10), PassThroughRiskManager(), broker)
+    asyncio.run(engine.run_once_async(["SPY"]))
+    state = broker.get_portfolio()
+    assert state.position("SPY") == 10.0
+    assert state.cash == 100_000.0 - 10.0 * 400.0
+
+
+def test_observers_see_fills_applied_locally():
+    prices = {"SPY": 400.0, "QQQ": 300.0}
+    seen = []
+
+    def observer(trade, portfolio):
+        seen.append((trade.symbol, portfolio.cash, dict(portfolio.positions)))
+
+    broker = _BatchRecordingBroker(initial_cash=10_000.0, latest_prices=prices)
+    engine = ExecutionEngine(
+        _BuyEachStrategy(quantity=10), PassThroughRiskManager(), broker, observers=[observer]
+    )
+    engine.run_once(["SPY", "QQQ"])
+    assert seen == [
+        ("SPY", 6_000.0, {"SPY": 10.0}),
+        ("QQQ", 3_000.0, {"SPY": 10.0, "QQQ": 10.0}),
+    ]
+
+
+def test_portfolio_from_state_copies_positions():
+    book = Portfolio(positions={"SPY": 1.0}).positions  # a PositionBook
+    engine = ExecutionEngine(
+        _BuyEachStrategy(quantity=1), PassThroughRiskManager(), PaperBrokerAdapter()
+    )
+    portfolio = engine._portfolio_from_state(PortfolioState(cash=0.0, positions=book))
+    portfolio.update_position("SPY", 1.0)
+    assert book["SPY"] == 1.0
+
+
+def test_observer_portfolios_are_independent_snapshots():
+    kept = []
+
+    class _KeepPortfolio(_BuyEachStrategy):
+        def on_event(self, event, portfolio=None):
+            self.portfolio = portfolio
+            return super().on_event(event, portfolio)
+
+    strategy = _KeepPortfolio(quantity=1)
+    broker = PaperBrokerAdapter(initial_cash=1_000.0, latest_prices={"A": 10.0, "B": 20.0})
+    engine = ExecutionEngine(
+        strategy, PassThroughRiskManager(), broker, observers=[lambda t, p: kept.append(p)]
+    )
+    engine.run_once(["A", "B"])
+    assert [(p.cash, dict(p.positions)) for p in kept] == [
+        (990.0, {"A": 1.0}),
+        (970.0, {"A": 1.0, "B": 1.0}),
+    ]
+    assert (strategy.portfolio.cash, dict(strategy.portfolio.positions)) == (1_000.0, {})
+
+
+@pytest.mark.parametrize("reconcile_every", [1, 2, 3])
+def test_observers_see_cumulative_fills_when_reconciling(reconcile_every, caplog):
+    seen = []
+    broker = PaperBrokerAdapter(initial_cash=100.0, latest_prices={"A": 10.0, "B": 10.0, "C": 10.0})
+    engine = ExecutionEngine(
+        _BuyEachStrategy(quantity=1),
+        PassThroughRiskManager(),
+        broker,
+        observers=[lambda trade, p: seen.append((p.cash, sum(p.positions.values())))],
+        reconcile_every=reconcile_every,
+    )
+    with caplog.at_level("WARNING", logger="qtos_core.execution.engine"):
+        engine.run_once(["A", "B", "C"])
+    # Each observer sees the state right after its own fill, never the whole batch.
+    assert seen == [(90.0, 1.0), (80.0, 2.0), (70.0, 3.0)]
+    state = broker.get_portfolio()
+    assert (state.cash, sum(state.positions.values())) == (70.0, 3.0)
+    assert "drift" not in caplog.text
+
+
+class _FeeBroker(PaperBrokerAdapter):
+    """Charges a flat fee per batch that the engine does not know about."""
+
+    def submit_orders(self, orders, *, now=None):
+        statuses = super().submit_orders(orders, now=now)
+        self._cash -= 1.0
+        return statuses
+
+
+def test_reconcile_logs_drift_from_broker(caplog):
+    broker = _FeeBroker(initial_cash=100.0, latest_prices={"A": 10.0, "B": 10.0})
+    calls = 0
+    get_portfolio = broker.get_portfolio
+
+    def counting_get_portfolio(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return get_portfolio(*args, **kwargs)
+
+    broker.get_portfolio = counting_get_portfolio
+    engine = ExecutionEngine(
+        _BuyEachStrategy(quantity=1), PassThroughRiskManager(), broker, reconcile_every=3
+    )
+    with caplog.at_level("WARNING", logger="qtos_core.execution.engine"):
+        engine.run_once(["A", "B"])  # 2 fills: below the cadence
+        assert calls == 1 and "drift" not in caplog.text
+        engine.run_once(["A", "B"])  # 4 fills: reconciles once after the batch
+    assert calls == 3
+    assert "Portfolio drift at reconcile: cash -1.000000" in caplog.text
+
+
+class _LegacyBroker(BrokerAdapter):
+    """Adapter written against the original ABC: submit_order(self, order), no `now`."""
+
+    def __init__(self, **kwargs):
+        self._paper = PaperBrokerAdapter(**kwargs)
+        self.submitted = 0
+
+    def submit_order(self, order):
+        self.submitted += 1
+        return self._paper.submit_order(order)
+
+    def get_portfolio(self):
+        return self._paper.get_portfolio()
+
+    def get_market_data(self, symbols):
+        return self._paper.get_market_data(symbols)
+
+
+def test_legacy_submit_order_signature_still_works():
+    broker = _LegacyBroker(initial_cash=1_000.0, latest_prices={"SPY": 10.0, "QQQ": 20.0})
+    engine = ExecutionEngine(_BuyEachStrategy(quantity=1), PassThroughRiskManager(), broker)
+    engine.run_once(["SPY", "QQQ"])
+    state = broker.get_portfolio()
+    assert (state.cash, dict(state.positions)) == (970.0, {"SPY": 1.0, "QQQ": 1.0})
+    proxy = CoalescingBrokerProxy(broker)
+    status = proxy.submit_order(Order(symbol="SPY", side=Side.BUY, quantity=1.0))
+    assert status.status == OrderStatusKind.FILLED
+    assert broker.submitted == 3
+
+
+class _SlowPortfolioBroker(PaperBrokerAdapter):
+    """Counts get_portfolio calls; each blocks until release is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+        self.release = threading.Event()
+
+    def get_portfolio(self):
+        self.calls += 1
+        self.release.wait(timeout=5)
+        return super().get_portfolio()
+
+
+def test_coalescing_proxy_shares_in_flight_portfolio_fetch():
+    inner = _SlowPortfolioBroker(initial_cash=1_000.0, latest_prices={"SPY": 10.0})
+    proxy = CoalescingBrokerProxy(inner, ttl=60.0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(proxy.get_portfolio())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    inner.release.set()
+    for t in threads:
+        t.join()
+    assert len(results) == 8
+    assert all(r is results[0] for r in results)
+    assert inner.calls == 1
+    assert proxy.get_portfolio() is results[0]  # within ttl
+
+    proxy.submit_orders([Order(symbol="SPY", side=Side.BUY, quantity=1.0)])
+    state = proxy.get_portfolio()
+    assert inner.calls == 2
+    assert state.position("SPY") == 1.0
+    assert len(proxy.get_order_log()) == 1  # delegated to the wrapped broker